@@ -1,8 +1,18 @@
+import datetime
+import functools
+import os
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-from sklearn.preprocessing import StandardScaler
+
+from dropout import instrument
+from dropout.cache import PredictionCache, artifact_fingerprint
+from dropout.features import COHORT_INDEX_PATH, FEATURE_NAMES, INSIGHTS_PATH, MODEL_PATH
+
+# pandas, numpy, xgboost and scikit-learn are imported on first use inside the
+# functions below, so the page starts rendering before they are loaded
+
+# Serving backend: joblib (default), folded or compiled, see dropout/scoring.py
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'joblib')
 
 # Set page configuration
 st.set_page_config(
@@ -11,65 +21,121 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load the model
+# One minified stylesheet for all custom HTML cards, built once per process
+@st.cache_resource
+def get_stylesheet():
+    from dropout.styles import PLAN_CSS, RECOMMENDATION_CSS, minify_css
+    
+    return minify_css(PLAN_CSS + RECOMMENDATION_CSS)
+
+# Sent with the prediction results: Streamlit drops elements a rerun of their
+# fragment does not send again, while reruns of other fragments keep them
+def register_styles():
+    st.html(f"<style>{get_stylesheet()}</style>")
+
+# st.fragment that records its own trace: fragment-scoped reruns skip main() and
+# its instrument.rerun() scope, so they flush their spans and draw the debug panel here
+def fragment(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            standalone = not instrument.in_rerun()
+            with instrument.rerun(name):
+                result = fn(*args, **kwargs)
+            if standalone:
+                show_debug_panel()
+            return result
+        return st.fragment(wrapper)
+    return decorate
+
+# Load the model (cached per artifact fingerprint, so a new model file is picked up)
+@instrument.traced('load_model')
 @st.cache_resource
-def load_model():
+def load_model(fingerprint=None):
+    from dropout.scoring import load_backend_model
+
     try:
-        model = joblib.load('model/model_xgb.joblib')
+        model = load_backend_model(MODEL_BACKEND)
         return model
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None
 
-# Load the scaler - we'll create a new one since we don't have the saved scaler
+# Load the scaler statistics saved alongside the model
+@instrument.traced('get_scaler')
 @st.cache_resource
-def get_scaler():
+def get_scaler(fingerprint=None):
+    from dropout.scoring import load_backend_scaler
+
     try:
-        # Load dataset to fit the scaler
-        df = pd.read_csv('data/encoded_data.csv')
-        df = df[df['Status'] != 1]  # Remove 'Enrolled' status
-        df.loc[:, 'Status'] = df['Status'].replace({2: 1})  # Replace 'Graduate' with 1
-        X = df.drop(columns=['Status'], axis=1)
-        
-        # Create and fit scaler
-        scaler = StandardScaler()
-        scaler.fit(X)
-        return scaler
+        return load_backend_scaler(MODEL_BACKEND)
     except Exception as e:
-        st.error(f"Error loading data or creating scaler: {e}")
+        st.error(f"Error loading preprocessing bundle: {e}")
+        return None
+
+# Prediction cache shared by all sessions of this server process
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache()
+
+# Peer percentile index built by `python -m dropout.cohort`
+@instrument.traced('get_cohort_index')
+@st.cache_resource
+def get_cohort_index(fingerprint=None):
+    from dropout.cohort import load_index
+
+    try:
+        return load_index(COHORT_INDEX_PATH)
+    except FileNotFoundError:
+        return None
+
+# Global insights written at training time by dropout.insights
+@instrument.traced('get_model_insights')
+@st.cache_data
+def get_model_insights(fingerprint=None):
+    from dropout.insights import load_insights
+    from dropout.preprocessing import file_checksum
+
+    try:
+        insights = load_insights(INSIGHTS_PATH)
+    except FileNotFoundError:
         return None
+    insights["stale"] = insights["model_sha256"] != file_checksum(MODEL_PATH)
+    return insights
 
 # Function to make prediction
+@instrument.traced('predict_dropout')
 def predict_dropout(features, model, scaler):
-    # Create a DataFrame with the input features
-    feature_names = ['Marital_status', 'Application_mode', 'Application_order', 'Course',
-                    'Daytime_evening_attendance', 'Previous_qualification', 
-                    'Previous_qualification_grade', 'Nacionality', 'Mothers_qualification',
-                    'Fathers_qualification', 'Mothers_occupation', 'Fathers_occupation',
-                    'Admission_grade', 'Displaced', 'Educational_special_needs', 'Debtor',
-                    'Tuition_fees_up_to_date', 'Gender', 'Scholarship_holder', 'Age_at_enrollment',
-                    'International', 'Curricular_units_1st_sem_credited',
-                    'Curricular_units_1st_sem_enrolled', 'Curricular_units_1st_sem_evaluations',
-                    'Curricular_units_1st_sem_approved', 'Curricular_units_1st_sem_grade',
-                    'Curricular_units_1st_sem_without_evaluations', 'Curricular_units_2nd_sem_credited',
-                    'Curricular_units_2nd_sem_enrolled', 'Curricular_units_2nd_sem_evaluations',
-                    'Curricular_units_2nd_sem_approved', 'Curricular_units_2nd_sem_grade',
-                    'Curricular_units_2nd_sem_without_evaluations', 'Unemployment_rate',
-                    'Inflation_rate', 'GDP']
-    
-    features_df = pd.DataFrame([features], columns=feature_names)
-    
-    # Scale features
-    scaled_features = scaler.transform(features_df)
-    
-    # Make prediction
-    prediction = model.predict(scaled_features)[0]
-    probability = model.predict_proba(scaled_features)[0]
-    
-    return prediction, probability
+    import numpy as np
+
+    from dropout.scoring import predict_batch
+
+    # One row in training column order
+    row = np.array([[features[name] for name in FEATURE_NAMES]], dtype=np.float64)
+    
+    # Scale and score in a single model pass
+    predictions, probabilities = predict_batch(row, model, scaler)
+    
+    return predictions[0], probabilities[0]
+
+# Per-feature TreeSHAP contributions toward dropout, None for the compiled backend
+@instrument.traced('explain_dropout')
+def explain_dropout(features, model, scaler):
+    # The compiled backend has no booster to explain, and must not pull in xgboost
+    if not hasattr(model, 'get_booster'):
+        return None
+
+    import numpy as np
+
+    from dropout.explain import dropout_contributions
+
+    row = np.array([[features[name] for name in FEATURE_NAMES]], dtype=np.float64)
+    contributions, _ = dropout_contributions(row, model, scaler)
+    return contributions[0]
 
 # Define mapping dictionaries for categorical features
-@st.cache_data
+@instrument.traced('get_category_mappings')
+@st.cache_resource
 def get_category_mappings():
     # Marital Status
     marital_status_map = {
@@ -230,730 +296,674 @@ def get_category_mappings():
         "previous_qualification": previous_qualification_map
     }
 
+# Select box options, built once per process instead of on every rerun
+@st.cache_resource
+def get_form_options():
+    return {name: list(mapping) for name, mapping in get_category_mappings().items()}
+
+# Feature columns shown through a category mapping, or as the form's two choices
+FEATURE_MAPPINGS = {
+    'Marital_status': 'marital_status',
+    'Nacionality': 'nationality',
+    'Application_mode': 'application_mode',
+    'Course': 'course',
+    'Mothers_qualification': 'education_level',
+    'Fathers_qualification': 'education_level',
+    'Mothers_occupation': 'occupation',
+    'Fathers_occupation': 'occupation',
+    'Previous_qualification': 'previous_qualification',
+}
+FEATURE_CHOICES = {
+    'Gender': ("Female", "Male"),
+    'Daytime_evening_attendance': ("Daytime", "Evening"),
+    **{name: ("No", "Yes") for name in ('Displaced', 'Educational_special_needs', 'Debtor',
+                                        'Tuition_fees_up_to_date', 'Scholarship_holder', 'International')},
+}
+
+def feature_value_label(name, value, category_mappings):
+    """Value of a feature as the form shows it rather than its encoded code"""
+    if name in FEATURE_MAPPINGS:
+        return category_mappings[FEATURE_MAPPINGS[name]].get(value, f"Unknown ({value})")
+    if name in FEATURE_CHOICES:
+        return FEATURE_CHOICES[name][int(value)]
+    return value
+
+@instrument.traced('generate_intervention_plan')
 def generate_intervention_plan(student_data, prediction_result, dropout_probability):
     """Generate a personalized intervention plan based on student data and prediction"""
+    from dropout.report import LOW_RISK_NOTE, card_templates, plan_body
+    from dropout.rules import INTERVENTION_RULES, matched
+    
     st.subheader("Personalized Intervention Plan")
     
-    # Create a modern styled container for the plan
-    st.markdown("""
-    <style>
-    .plan-container {
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    .risk-card {
-        background-color: white;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        padding: 20px;
-        margin-bottom: 4px;
-        transition: transform 0.2s ease;
-    }
-    .risk-card:hover {
-        transform: translateY(-5px);
-    }
-    .risk-header {
-        display: flex;
-        align-items: center;
-        margin-bottom: 4px;
-    }
-    .risk-icon {
-        background-color: #f0f8ff;
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin-right: 15px;
-        color: #3498db;
-        font-size: 20px;
-    }
-    .risk-title {
-        font-size: 18px;
-        font-weight: 600;
-        color: #2c3e50;
-    }
-    .risk-description {
-        padding-left: 55px;
-        color: #4a5568;
-        font-size: 15px;
-        border-radius: 10px;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
-        padding: 16px 20px;
-        margin-bottom: 16px;
-    }
-    .interventions-container {
-        background-color: #f8fafc;
-        border-radius: 10px;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
-        padding: 8px 14px;
-    }
-    .intervention-item {
-        display: flex;
-        margin-bottom: 8px;
-        font-size: 20px;
-        color: #2d3748;
-        line-height: 1.5;
-    }
-    .intervention-bullet {
-        color: #3498db;
-        margin-right: 10px;
-        font-weight: bold;
-    }
-    .intervention-text {
-        color: #2d3748;
-        font-size: 16px;
-    }
-    .risk-badge {
-        display: inline-block;
-        padding: 5px 12px;
-        border-radius: 20px;
-        font-size: 14px;
-        font-weight: bold;
-        margin-left: 10px;
-    }
-    .risk-high {
-        background-color: rgba(231, 76, 60, 0.15);
-        color: #c0392b;
-    }
-    .risk-medium {
-        background-color: rgba(243, 156, 18, 0.15);
-        color: #d35400;
-    }
-    .risk-low {
-        background-color: rgba(46, 204, 113, 0.15);
-        color: #27ae60;
-    }
-    .timeline-card {
-        background-color: #f8fafc;
-        border-radius: 10px;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
-        padding: 16px 20px;
-        margin-bottom: 16px;
-    }
-    .timeline-header {
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 10px;
-        display: flex;
-        align-items: center;
-        font-size: 16px;
-    }
-    .timeline-icon {
-        margin-right: 10px;
-        color: #3498db;
-    }
-    .timeline-items {
-        padding-left: 25px;
-    }
-    .timeline-item {
-        display: flex;
-        margin-bottom: 8px;
-        font-size: 15px;
-        color: #2d3748;
-        line-height: 1.5;
-    }
-    .timeline-item:last-child {
-        margin-bottom: 0;
-    }
-    .section-header {
-        background: linear-gradient(90deg, #3498db, #2c3e50);
-        color: white;
-        padding: 12px 20px;
-        border-radius: 8px;
-        margin: 30px 0 20px 0;
-        font-weight: 600;
-        display: flex;
-        align-items: center;
-        font-size: 17px;
-    }
-    .section-icon {
-        margin-right: 10px;
-    }
-    </style>
-    <div class="plan-container">
-    """, unsafe_allow_html=True)
-    
-    # Determine risk level
-    if dropout_probability > 0.8:
-        risk_level = "High Risk"
-        risk_class = "risk-high"
-        risk_icon = "⚠️"
-    elif dropout_probability > 0.6:
-        risk_level = "Medium Risk"
-        risk_class = "risk-medium"
-        risk_icon = "⚠️"
-    else:
-        risk_level = "Low Risk"
-        risk_class = "risk-low"
-        risk_icon = "✓"
-    
-    # Display student overview
-    st.markdown(f"""
-    <div class="section-header">
-        <div class="section-icon">📊</div>
-        Student Risk Assessment
-    </div>
-    <div class="risk-card">
-        <div class="risk-header">
-            <div class="risk-icon">{risk_icon}</div>
-            <div class="risk-title">Risk Profile <span class="risk-badge {risk_class}">{risk_level}</span></div>
-        </div>
-        <div class="risk-description">
-            Based on our predictive model analysis, this student has a dropout probability of <strong>{dropout_probability:.1%}</strong>.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Identify key risk areas
-    risk_areas = []
-    
-    # Academic performance risks
-    if student_data['Curricular_units_1st_sem_approved'] / max(student_data['Curricular_units_1st_sem_enrolled'], 1) < 0.6:
-        risk_areas.append({
-            "area": "Academic Performance (1st Semester)",
-            "icon": "📚",
-            "description": f"Student passed only {student_data['Curricular_units_1st_sem_approved']} of {student_data['Curricular_units_1st_sem_enrolled']} courses.",
-            "interventions": [
-                "Weekly meetings with an academic advisor",
-                "Enrollment in supplemental instruction sessions",
-                "Consideration for course load reduction"
-            ]
-        })
+    # Cards are filled from the cached per-area templates and sent as one element,
+    # their styles are already on the page (see register_styles)
+    fired = matched(student_data, INTERVENTION_RULES, dropout_probability)[0]
+    body = plan_body(dropout_probability, fired, student_data, card_templates(), note=False)
+    st.html(f'<div class="plan-container">{body}</div>')
+    if not fired.any():
+        st.info(LOW_RISK_NOTE)
+
+# Redrawn on its own when its button is clicked, the form and prediction above stay as they are
+@fragment('show_intervention_plan')
+def show_intervention_plan():
+    if st.session_state.prediction_result is None:
+        return
     
-    if student_data['Curricular_units_2nd_sem_approved'] / max(student_data['Curricular_units_2nd_sem_enrolled'], 1) < 0.6:
-        risk_areas.append({
-            "area": "Academic Performance (2nd Semester)",
-            "icon": "📝",
-            "description": f"Student passed only {student_data['Curricular_units_2nd_sem_approved']} of {student_data['Curricular_units_2nd_sem_enrolled']} courses.",
-            "interventions": [
-                "Mandatory tutoring sessions for difficult subjects",
-                "Mid-semester progress review with program coordinator",
-                "Study skills workshop attendance"
-            ]
-        })
+    intervention_button = st.button(
+        "Generate Intervention Plan", 
+        help="Generate a detailed intervention plan for this student",
+        key="intervention_button"
+    )
     
-    # Financial risks
-    if student_data['Debtor'] == 1 or student_data['Tuition_fees_up_to_date'] == 0:
-        risk_areas.append({
-            "area": "Financial Stability",
-            "icon": "💰",
-            "description": "Student has financial difficulties with tuition payments.",
-            "interventions": [
-                "Financial aid office consultation",
-                "Payment plan options review",
-                "Emergency scholarship or grant application",
-                "Part-time campus employment opportunities"
-            ]
-        })
+    if intervention_button:
+        st.session_state.show_intervention = True
     
-    # Social integration risks (if relevant data available)
-    if student_data['International'] == 1 or student_data['Displaced'] == 1:
-        risk_areas.append({
-            "area": "Social Integration",
-            "icon": "👥",
-            "description": "Student may face adjustment challenges due to international/displaced status.",
-            "interventions": [
-                "Connection with student communities for similar backgrounds",
-                "Regular check-ins with international student office",
-                "Cultural transition support group",
-                "Mentor matching program"
-            ]
+    # Display intervention plan if button was clicked
+    if st.session_state.show_intervention:
+        # For dropout prediction, use dropout probability; for graduation, use (1-graduation probability)
+        if st.session_state.prediction_result == 0:
+            dropout_prob = st.session_state.prediction_probability[0]
+        else:
+            dropout_prob = st.session_state.prediction_probability[0]  # Already the dropout probability
+        
+        generate_intervention_plan(
+            st.session_state.student_data, 
+            st.session_state.prediction_result,
+            dropout_prob
+        )
+
+# Percentile ranks of the student against the whole dataset and their peers
+def show_peer_comparison(features, cohort_index, category_mappings):
+    from dropout.cohort import METRICS
+
+    comparison = cohort_index.compare(features)
+    segments = comparison["segments"]
+    course_name = category_mappings["course"].get(features["Course"], f"Course {features['Course']}")
+    mode_name = category_mappings["application_mode"].get(features["Application_mode"], "this application mode")
+    
+    st.subheader("Peer Comparison")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Dropout rate, all students", f"{cohort_index.dropout_rate('all'):.1%}")
+    if segments["Course"]:
+        col2.metric(f"Dropout rate, {course_name}", f"{cohort_index.dropout_rate(segments['Course']):.1%}")
+    if segments["Application_mode"]:
+        col3.metric("Dropout rate, same application mode", f"{cohort_index.dropout_rate(segments['Application_mode']):.1%}")
+    
+    def rank(value):
+        if value is None:
+            return "-"
+        n = int(round(value))
+        suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+        return f"{n}{suffix}"
+    
+    rows = []
+    for metric in METRICS:
+        percentiles = comparison["percentiles"][metric]
+        rows.append({
+            "Metric": metric.replace("Curricular_units_", "").replace("_", " ").capitalize(),
+            "Student": features[metric],
+            "Percentile (all)": rank(percentiles["all"]),
+            "Percentile (course)": rank(percentiles["Course"]),
+            "Percentile (application mode)": rank(percentiles["Application_mode"]),
         })
+    st.dataframe(rows, hide_index=True)
     
-    # If no specific risk areas identified but still at risk
-    if not risk_areas and dropout_probability > 0.5:
-        risk_areas.append({
-            "area": "Multiple Factors",
-            "icon": "🔍",
-            "description": "No single major risk factor identified, but combination of minor factors increases dropout risk.",
-            "interventions": [
-                "Holistic student success meeting with advisor",
-                "Regular progress monitoring",
-                "Student engagement opportunities assessment",
-                "Academic and personal goal-setting workshop"
-            ]
+    groups = [f"{cohort_index.rows('all'):,} students in the dataset"]
+    if segments["Course"]:
+        groups.append(f"{cohort_index.rows(segments['Course']):,} in {course_name}")
+    if segments["Application_mode"]:
+        groups.append(f"{cohort_index.rows(segments['Application_mode']):,} admitted via {mode_name}")
+    st.caption("Percentiles against " + ", ".join(groups) + ".")
+
+# Model Insights tab, drawn only from the precomputed insights file
+def show_model_insights(insights):
+    import pandas as pd
+
+    from dropout.explain import feature_label
+
+    if insights is None:
+        st.info("No model insights found. Build them with `python -m dropout.insights`.")
+        return
+    if insights["stale"]:
+        st.warning("These insights were computed for a different model file. Rebuild them with `python -m dropout.insights`.")
+    
+    metrics = insights["metrics"]
+    st.subheader("Test Set Performance")
+    cols = st.columns(6)
+    cols[0].metric("Accuracy", f"{metrics['accuracy']:.3f}")
+    cols[1].metric("Precision", f"{metrics['precision']:.3f}")
+    cols[2].metric("Recall", f"{metrics['recall']:.3f}")
+    cols[3].metric("F1 Score", f"{metrics['f1']:.3f}")
+    cols[4].metric("ROC AUC", f"{metrics['roc_auc']:.3f}")
+    cols[5].metric("Brier Score", f"{metrics['brier']:.3f}")
+    st.caption(f"{insights['test_rows']:,} held-out students, computed {insights['created_at']}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Feature Importance")
+        importances = pd.DataFrame({
+            "Feature": [feature_label(name) for name in insights["importances"]["feature"]],
+            "Mean |SHAP|": insights["importances"]["mean_abs_shap"],
+            "Gain": insights["importances"]["gain"],
+        }).sort_values("Mean |SHAP|", ascending=False).head(15)
+        st.bar_chart(importances, x="Feature", y="Mean |SHAP|", horizontal=True, sort="-Mean |SHAP|")
+    
+    with col2:
+        st.subheader("Confusion Matrix")
+        labels = insights["labels"]
+        st.dataframe(
+            pd.DataFrame(
+                insights["confusion_matrix"],
+                index=[f"Actual {label}" for label in labels],
+                columns=[f"Predicted {label}" for label in labels],
+            )
+        )
+        st.subheader("Reliability Curve")
+        reliability = pd.DataFrame({
+            "Predicted dropout probability": insights["reliability"]["predicted"],
+            "Observed dropout rate": insights["reliability"]["observed"],
         })
+        reliability["Perfect calibration"] = reliability["Predicted dropout probability"]
+        st.line_chart(reliability, x="Predicted dropout probability", y=["Observed dropout rate", "Perfect calibration"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("ROC Curve (Dropout)")
+        st.line_chart(
+            pd.DataFrame({"False positive rate": insights["roc"]["fpr"], "True positive rate": insights["roc"]["tpr"]}),
+            x="False positive rate", y="True positive rate",
+        )
+    with col2:
+        st.subheader("Precision-Recall Curve (Dropout)")
+        st.line_chart(
+            pd.DataFrame({"Recall": insights["pr"]["recall"], "Precision": insights["pr"]["precision"]}),
+            x="Recall", y="Precision",
+        )
+        st.caption(f"Average precision: {metrics['average_precision']:.3f}")
+
+# Form and results rerun together on submit, without the title, model loading or the other tabs
+@fragment('prediction_panel')
+def prediction_panel(model, scaler, prediction_cache, fingerprint, cohort_index):
+    category_mappings = get_category_mappings()
+    form_options = get_form_options()
+    
+    # Create columns for better layout
+    col1, col2, col3 = st.columns(3)
     
-    # Display intervention plan for each risk area
-    if risk_areas:
-        st.markdown(f"""
-        <div class="section-header">
-            <div class="section-icon">🎯</div>
-            Targeted Intervention Areas
-        </div>
-        """, unsafe_allow_html=True)
+    with st.form("prediction_form"):
+        st.subheader("Personal Information")
+        col1, col2 = st.columns(2)
         
-        for area in risk_areas:
-            st.markdown(f"""
-            <div class="risk-card">
-                <div class="risk-header">
-                    <div class="risk-icon">{area["icon"]}</div>
-                    <div class="risk-title">{area["area"]}</div>
-                </div>
-                <div class="risk-description">{area["description"]}</div>
-                <div class="interventions-container">
-                    {"".join([f'<div class="intervention-item"><div class="intervention-bullet">•</div><div class="intervention-text">{intervention}</div></div>' for intervention in area["interventions"]])}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-        # Next steps and timeline
-        st.markdown(f"""
-        <div class="section-header">
-            <div class="section-icon">⏱️</div>
-            Implementation Timeline
-        </div>
-        """, unsafe_allow_html=True)
+        with col1:
+            marital_status = st.selectbox(
+                "Marital Status", 
+                options=form_options["marital_status"],
+                format_func=lambda x: category_mappings["marital_status"].get(x, f"Unknown ({x})")
+            )
+            
+            gender = st.radio("Gender", [0, 1], format_func=lambda x: "Female" if x == 0 else "Male")
+            age_at_enrollment = st.slider("Age at Enrollment", 17, 70, 20)
+            
+            nationality = st.selectbox(
+                "Nationality", 
+                options=form_options["nationality"],
+                format_func=lambda x: category_mappings["nationality"].get(x, f"Unknown ({x})")
+            )
+            
+            international = st.checkbox("International Student")
         
-        # Timeline cards
-        st.markdown(f"""
-        <div class="timeline-card">
-            <div class="timeline-header">
-                <div class="timeline-icon">🔵</div>
-                Immediate (Next 7 days)
-            </div>
-            <div class="timeline-items">
-                <div class="timeline-item">• Initial contact with student via email and phone</div>
-                <div class="timeline-item">• Schedule first advising appointment</div>
-                <div class="timeline-item">• Provide resource information packet</div>
-            </div>
-        </div>
+        with col2:
+            displaced = st.checkbox("Displaced Student")
+            educational_special_needs = st.checkbox("Has Educational Special Needs")
+            debtor = st.checkbox("Has Tuition Debt")
+            tuition_fees_up_to_date = st.checkbox("Tuition Fees Up to Date")
+            scholarship_holder = st.checkbox("Scholarship Holder")
         
-        <div class="timeline-card">
-            <div class="timeline-header">
-                <div class="timeline-icon">🔵</div>
-                Short-term (2-4 weeks)
-            </div>
-            <div class="timeline-items">
-                <div class="timeline-item">• Complete all initial consultations for identified risk areas</div>
-                <div class="timeline-item">• Establish regular check-in schedule</div>
-                <div class="timeline-item">• Set measurable goals for improvement</div>
-            </div>
-        </div>
+        st.subheader("Academic Background")
+        col1, col2 = st.columns(2)
         
-        <div class="timeline-card">
-            <div class="timeline-header">
-                <div class="timeline-icon">🔵</div>
-                Long-term (Semester)
-            </div>
-            <div class="timeline-items">
-                <div class="timeline-item">• Monthly progress assessment</div>
-                <div class="timeline-item">• Intervention strategy adjustments as needed</div>
-                <div class="timeline-item">• End-of-semester comprehensive review</div>
-            </div>
-        </div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.info("This student has a low risk profile. No specific interventions required at this time, but regular academic advising is recommended.")
-
-# Main function
-def main():
-    # Load model and scaler
-    model = load_model()
-    scaler = get_scaler()
+        with col1:
+            previous_qualification = st.selectbox(
+                "Previous Qualification Type", 
+                options=form_options["previous_qualification"],
+                format_func=lambda x: category_mappings["previous_qualification"].get(x, f"Unknown ({x})")
+            )
+            
+            previous_qualification_grade = st.slider("Previous Qualification Grade", 95.0, 200.0, 130.0, 0.5)
+            admission_grade = st.slider("Admission Grade", 95.0, 190.0, 125.0, 0.5)
+            
+            application_mode = st.selectbox(
+                "Application Mode", 
+                options=form_options["application_mode"],
+                format_func=lambda x: category_mappings["application_mode"].get(x, f"Unknown ({x})")
+            )
+            
+            application_order = st.slider("Application Preference Order", 1, 6, 1)
+            
+            course = st.selectbox(
+                "Course", 
+                options=form_options["course"],
+                format_func=lambda x: category_mappings["course"].get(x, f"Unknown ({x})")
+            )
+            
+            daytime_evening_attendance = st.radio("Attendance Time", [0, 1], format_func=lambda x: "Daytime" if x == 0 else "Evening")
+        
+        with col2:
+            mothers_qualification = st.selectbox(
+                "Mother's Qualification", 
+                options=form_options["education_level"],
+                format_func=lambda x: category_mappings["education_level"].get(x, f"Unknown ({x})")
+            )
+            
+            fathers_qualification = st.selectbox(
+                "Father's Qualification", 
+                options=form_options["education_level"],
+                format_func=lambda x: category_mappings["education_level"].get(x, f"Unknown ({x})")
+            )
+            
+            mothers_occupation = st.selectbox(
+                "Mother's Occupation", 
+                options=form_options["occupation"],
+                format_func=lambda x: category_mappings["occupation"].get(x, f"Unknown ({x})")
+            )
+            
+            fathers_occupation = st.selectbox(
+                "Father's Occupation", 
+                options=form_options["occupation"],
+                format_func=lambda x: category_mappings["occupation"].get(x, f"Unknown ({x})")
+            )
+        
+        st.subheader("Academic Performance (1st Semester)")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            curricular_units_1st_sem_credited = st.slider("Curricular Units Credited (1st Sem)", 0, 20, 0)
+            curricular_units_1st_sem_enrolled = st.slider("Curricular Units Enrolled (1st Sem)", 0, 20, 6)
+            curricular_units_1st_sem_evaluations = st.slider("Curricular Units Evaluations (1st Sem)", 0, 25, 6)
+        
+        with col2:
+            curricular_units_1st_sem_approved = st.slider("Curricular Units Approved (1st Sem)", 0, 20, 5)
+            curricular_units_1st_sem_grade = st.slider("Average Grade (1st Sem)", 0.0, 20.0, 13.0, 0.1)
+            curricular_units_1st_sem_without_evaluations = st.slider("Units Without Evaluations (1st Sem)", 0, 10, 0)
+        
+        st.subheader("Academic Performance (2nd Semester)")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            curricular_units_2nd_sem_credited = st.slider("Curricular Units Credited (2nd Sem)", 0, 20, 0)
+            curricular_units_2nd_sem_enrolled = st.slider("Curricular Units Enrolled (2nd Sem)", 0, 20, 6)
+            curricular_units_2nd_sem_evaluations = st.slider("Curricular Units Evaluations (2nd Sem)", 0, 25, 6)
+        
+        with col2:
+            curricular_units_2nd_sem_approved = st.slider("Curricular Units Approved (2nd Sem)", 0, 20, 5)
+            curricular_units_2nd_sem_grade = st.slider("Average Grade (2nd Sem)", 0.0, 20.0, 13.0, 0.1)
+            curricular_units_2nd_sem_without_evaluations = st.slider("Units Without Evaluations (2nd Sem)", 0, 12, 0)
+        
+        st.subheader("Economic Context")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            unemployment_rate = st.slider("Unemployment Rate", 7.0, 17.0, 10.8, 0.1)
+        
+        with col2:
+            inflation_rate = st.slider("Inflation Rate", -1.0, 4.0, 1.4, 0.1)
+        
+        with col3:
+            gdp = st.slider("GDP", -5.0, 4.0, 1.0, 0.01)
+        
+        # Submit button
+        submit_button = st.form_submit_button("Predict")
     
-    if not model or not scaler:
-        st.error("Failed to load model or scaler. Please check the error messages.")
+    if submit_button:
+        # Create features dictionary
+        features = {
+            'Marital_status': marital_status,
+            'Application_mode': application_mode,
+            'Application_order': application_order,
+            'Course': course,
+            'Daytime_evening_attendance': daytime_evening_attendance,
+            'Previous_qualification': previous_qualification,
+            'Previous_qualification_grade': previous_qualification_grade,
+            'Nacionality': nationality,
+            'Mothers_qualification': mothers_qualification,
+            'Fathers_qualification': fathers_qualification,
+            'Mothers_occupation': mothers_occupation,
+            'Fathers_occupation': fathers_occupation,
+            'Admission_grade': admission_grade,
+            'Displaced': int(displaced),
+            'Educational_special_needs': int(educational_special_needs),
+            'Debtor': int(debtor),
+            'Tuition_fees_up_to_date': int(tuition_fees_up_to_date),
+            'Gender': gender,
+            'Scholarship_holder': int(scholarship_holder),
+            'Age_at_enrollment': age_at_enrollment,
+            'International': int(international),
+            'Curricular_units_1st_sem_credited': curricular_units_1st_sem_credited,
+            'Curricular_units_1st_sem_enrolled': curricular_units_1st_sem_enrolled,
+            'Curricular_units_1st_sem_evaluations': curricular_units_1st_sem_evaluations,
+            'Curricular_units_1st_sem_approved': curricular_units_1st_sem_approved,
+            'Curricular_units_1st_sem_grade': curricular_units_1st_sem_grade,
+            'Curricular_units_1st_sem_without_evaluations': curricular_units_1st_sem_without_evaluations,
+            'Curricular_units_2nd_sem_credited': curricular_units_2nd_sem_credited,
+            'Curricular_units_2nd_sem_enrolled': curricular_units_2nd_sem_enrolled,
+            'Curricular_units_2nd_sem_evaluations': curricular_units_2nd_sem_evaluations,
+            'Curricular_units_2nd_sem_approved': curricular_units_2nd_sem_approved,
+            'Curricular_units_2nd_sem_grade': curricular_units_2nd_sem_grade,
+            'Curricular_units_2nd_sem_without_evaluations': curricular_units_2nd_sem_without_evaluations,
+            'Unemployment_rate': unemployment_rate,
+            'Inflation_rate': inflation_rate,
+            'GDP': gdp
+        }
+        
+        # Make prediction and explain it, reusing both for an identical profile
+        cached = prediction_cache.get(features, fingerprint)
+        if cached is None:
+            instrument.increment("prediction_cache_miss")
+            cached = (*predict_dropout(features, model, scaler), explain_dropout(features, model, scaler))
+            prediction_cache.put(features, cached, fingerprint)
+        else:
+            instrument.increment("prediction_cache_hit")
+        prediction, probability, contributions = cached
+        
+        # Convert numpy float32 to Python float to avoid Streamlit error
+        probability = [float(p) for p in probability]
+        
+        # Store results in session state
+        st.session_state.prediction_result = int(prediction)
+        st.session_state.prediction_probability = probability
+        st.session_state.student_data = features
+        st.session_state.prediction_contributions = contributions
+        st.session_state.show_intervention = False
+    
+    show_prediction_results(cohort_index)
+    show_what_if(model, scaler)
+    
+    # Generate Intervention Plan button with functionality
+    show_intervention_plan()
+    
+    # Redrawn with every prediction, so the counts stay current
+    cache_stats = prediction_cache.stats()
+    st.caption(
+        f"Prediction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['size']}/{cache_stats['maxsize']} entries"
+    )
+
+# Redrawn only for a new prediction, not when the intervention plan reruns
+@fragment('show_prediction_results')
+def show_prediction_results(cohort_index):
+    if st.session_state.prediction_result is None:
         return
     
-    # Get category mappings
+    features = st.session_state.student_data
+    prediction = st.session_state.prediction_result
+    probability = st.session_state.prediction_probability
+    contributions = st.session_state.prediction_contributions
     category_mappings = get_category_mappings()
     
-    # Page title and description
+    # Card styles are only needed once there is a prediction to show
+    register_styles()
+    
+    # Display prediction
+    st.subheader("Prediction Result")
+    
+    # Create columns for the prediction display
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if prediction == 0:
+            st.error("⚠️ High Risk of Dropout")
+            st.write(f"Probability: {probability[0]:.2%}")
+        else:
+            st.success("🎓 Likely to Graduate")
+            st.write(f"Probability: {probability[1]:.2%}")
+    
+    with col2:
+        # Create a progress bar for the confidence
+        if prediction == 0:
+            st.write("Dropout Probability:")
+            st.progress(probability[0])
+            st.write("Graduation Probability:")
+            st.progress(probability[1])
+        else:
+            st.write("Graduation Probability:")
+            st.progress(probability[1])
+            st.write("Dropout Probability:")
+            st.progress(probability[0])
+    
+    # Compare the student with peers from the precomputed index
+    if cohort_index is not None:
+        show_peer_comparison(features, cohort_index, category_mappings)
+    
+    # Display risk factors if high dropout risk
+    if prediction == 0 and probability[0] > 0.7:
+        st.subheader("Potential Risk Factors")
+        risk_factors = []
+        
+        # Features the model weighted toward dropout for this student
+        if contributions is not None:
+            from dropout.explain import feature_label, risk_factors as model_risk_factors
+            
+            for name, value, contribution in model_risk_factors(features, contributions):
+                value = feature_value_label(name, value, category_mappings)
+                risk_factors.append(f"{feature_label(name)}: {value} (+{contribution:.2f} log-odds toward dropout)")
+        
+        # Fall back to rule-of-thumb checks when the backend cannot be explained
+        else:
+            from dropout.rules import risk_factor_labels
+            
+            risk_factors.extend(risk_factor_labels(features))
+        
+        # Display risk factors as a bulleted list
+        if risk_factors:
+            for factor in risk_factors:
+                st.write(f"• {factor}")
+        else:
+            st.write("No specific risk factors identified, but the combination of various attributes indicates dropout risk.")
+    
+    # Display potential interventions if high dropout risk
+    if prediction == 0 and probability[0] > 0.6:
+        st.subheader("Recommended Interventions")
+        
+        # Create a container with custom styling for recommendations
+        recommendation_container = st.container()
+        with recommendation_container:
+            recommendations = [
+                {
+                    "title": "Academic Advising",
+                    "description": "Schedule a meeting with an academic advisor to discuss course progress and create a structured study plan."
+                },
+                {
+                    "title": "Tutoring Services",
+                    "description": "Connect with the tutoring center for additional academic support in challenging subjects."
+                },
+                {
+                    "title": "Financial Assistance",
+                    "description": "Meet with the financial aid office to explore scholarship options, payment plans, or emergency funding."
+                },
+                {
+                    "title": "Regular Check-ins",
+                    "description": "Establish bi-weekly check-ins with a faculty mentor to track progress and address concerns early."
+                },
+                {
+                    "title": "Study Skills Workshop",
+                    "description": "Attend workshops on time management, note-taking, and effective study techniques."
+                }
+            ]
+            
+            for rec in recommendations:
+                st.markdown(f"""
+                <div class="recommendation-box">
+                    <div class="recommendation-title">{rec["title"]}</div>
+                    <div class="recommendation-desc">{rec["description"]}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown("---")
+
+# Dropout probability as one or two features vary, the whole grid scored in one batch.
+# Changing the features reruns only this panel.
+@fragment('show_what_if')
+def show_what_if(model, scaler):
+    if st.session_state.prediction_result is None:
+        return
+    
+    import time
+    
+    import pandas as pd
+    
+    from dropout.explain import feature_label
+    from dropout.whatif import MAX_FEATURES, WHATIF_FEATURES, sensitivity
+    
+    st.subheader("What-if Explorer")
+    student = st.session_state.student_data
+    names = st.multiselect(
+        "Features to vary (up to two)",
+        options=list(WHATIF_FEATURES),
+        default=["Curricular_units_2nd_sem_approved"],
+        max_selections=MAX_FEATURES,
+        format_func=feature_label,
+        key="what_if_features",
+    )
+    if not names:
+        st.info("Choose a feature to see how the dropout probability would change.")
+        return
+    
+    start = time.perf_counter()
+    axes, probability = sensitivity(student, names, model, scaler)
+    elapsed = time.perf_counter() - start
+    labels = [feature_label(name) for name in names]
+    current = st.session_state.prediction_probability[0]
+    
+    if len(names) == 1:
+        curve = pd.DataFrame({labels[0]: axes[0], "Dropout probability": probability})
+        st.line_chart(curve, x=labels[0], y="Dropout probability")
+        best = int(probability.argmin())
+        st.caption(
+            f"Now {student[names[0]]} ({current:.1%} dropout probability); "
+            f"lowest {probability[best]:.1%} at {axes[0][best]:g}."
+        )
+    else:
+        import altair as alt
+        
+        grid = pd.Series(
+            probability.ravel(), index=pd.MultiIndex.from_product(axes, names=labels), name="Dropout probability"
+        ).reset_index()
+        st.altair_chart(
+            alt.Chart(grid).mark_rect().encode(
+                x=alt.X(f"{labels[1]}:O"),
+                y=alt.Y(f"{labels[0]}:O", sort="descending"),
+                color=alt.Color(
+                    "Dropout probability:Q",
+                    scale=alt.Scale(domain=[0, 1], scheme="redyellowgreen", reverse=True),
+                ),
+                tooltip=[labels[0], labels[1], alt.Tooltip("Dropout probability:Q", format=".1%")],
+            ),
+        )
+        best = grid["Dropout probability"].idxmin()
+        st.caption(
+            f"Now {student[names[0]]} / {student[names[1]]} ({current:.1%} dropout probability); "
+            f"lowest {grid.at[best, 'Dropout probability']:.1%} at "
+            f"{grid.at[best, labels[0]]:g} / {grid.at[best, labels[1]]:g}."
+        )
+    
+    st.caption(f"Scored {probability.size:,} scenarios in {elapsed * 1000:.0f} ms")
+
+# Static content, never rerun by the prediction panel
+@fragment('show_about')
+def show_about():
+    st.subheader("About this Prediction System")
+    st.write("""
+    ### Model Information
+    This prediction system uses an XGBoost machine learning model trained on historical student data 
+    to predict whether a student is likely to drop out or graduate. The model analyzes various factors 
+    including personal information, academic performance, and socioeconomic indicators.
+    
+    ### Features Used
+    - **Personal Information**: Age, gender, marital status, nationality
+    - **Academic Background**: Previous qualification, admission grades
+    - **Family Background**: Parents' education and occupation
+    - **Financial Factors**: Scholarship status, tuition payment status
+    - **Academic Performance**: Course units, grades for multiple semesters
+    - **Economic Context**: Unemployment rate, inflation rate, GDP
+    
+    ### Interpretation
+    The model provides a probability score indicating how likely a student is to drop out or graduate.
+    Higher dropout probability suggests greater risk that requires intervention.
+    
+    ### Disclaimer
+    This tool is meant to be used as a screening mechanism to identify students who might benefit from 
+    additional support. It should not be used as the sole decision-making factor for academic interventions.
+    """)
+    
+    st.subheader("Dataset")
+    st.write("""
+    The model was trained using a dataset containing anonymized student records with various 
+    attributes and their eventual academic outcomes (dropout or graduation).
+    """)
+
+# Per-rerun timings, shown with ?debug=1 when DROPOUT_INSTRUMENT=1
+def show_debug_panel():
+    if not instrument.ENABLED or st.query_params.get("debug") != "1":
+        return
+    
+    with st.expander("Debug: rerun timings", expanded=True):
+        st.dataframe(
+            [{"span": s["name"], "duration_ms": round(s["duration_ms"], 3)} for s in instrument.recorder.spans],
+            hide_index=True,
+        )
+        st.caption(f"Metrics file: {instrument.recorder.metrics_file}")
+
+# Main function
+@instrument.traced('main')
+def main():
+    # Page title and description, sent before the model is loaded
     st.title("🎓 Student Dropout Prediction System")
     st.write("""
     This app predicts whether a student is likely to drop out or graduate based on various factors.
     Fill in the form below with student information to get a prediction.
     """)
     
+    # Load model and scaler
+    fingerprint = artifact_fingerprint()
+    with st.spinner("Loading model..."):
+        model = load_model(fingerprint)
+        scaler = get_scaler(fingerprint)
+    prediction_cache = get_prediction_cache()
+    cohort_index = get_cohort_index(artifact_fingerprint(COHORT_INDEX_PATH))
+    
+    if not model or not scaler:
+        st.error("Failed to load model or scaler. Please check the error messages.")
+        return
+    
     # Create tabs for different sections
-    tab1, tab2 = st.tabs(["Prediction Form", "About"])
+    tab1, tab_insights, tab2 = st.tabs(["Prediction Form", "Model Insights", "About"])
     
     # State management for intervention plan
     if "prediction_result" not in st.session_state:
         st.session_state.prediction_result = None
         st.session_state.prediction_probability = None
         st.session_state.student_data = None
+        st.session_state.prediction_contributions = None
         st.session_state.show_intervention = False
     
     with tab1:
-        # Create columns for better layout
-        col1, col2, col3 = st.columns(3)
+        prediction_panel(model, scaler, prediction_cache, fingerprint, cohort_index)
         
-        with st.form("prediction_form"):
-            st.subheader("Personal Information")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                marital_status_options = list(category_mappings["marital_status"].items())
-                marital_status = st.selectbox(
-                    "Marital Status", 
-                    options=[status[0] for status in marital_status_options],
-                    format_func=lambda x: category_mappings["marital_status"].get(x, f"Unknown ({x})")
-                )
-                
-                gender = st.radio("Gender", [0, 1], format_func=lambda x: "Female" if x == 0 else "Male")
-                age_at_enrollment = st.slider("Age at Enrollment", 17, 70, 20)
-                
-                nationality_options = list(category_mappings["nationality"].items())
-                nationality = st.selectbox(
-                    "Nationality", 
-                    options=[nat[0] for nat in nationality_options],
-                    format_func=lambda x: category_mappings["nationality"].get(x, f"Unknown ({x})")
-                )
-                
-                international = st.checkbox("International Student")
-            
-            with col2:
-                displaced = st.checkbox("Displaced Student")
-                educational_special_needs = st.checkbox("Has Educational Special Needs")
-                debtor = st.checkbox("Has Tuition Debt")
-                tuition_fees_up_to_date = st.checkbox("Tuition Fees Up to Date")
-                scholarship_holder = st.checkbox("Scholarship Holder")
-            
-            st.subheader("Academic Background")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                previous_qualification_options = list(category_mappings["previous_qualification"].items())
-                previous_qualification = st.selectbox(
-                    "Previous Qualification Type", 
-                    options=[qual[0] for qual in previous_qualification_options],
-                    format_func=lambda x: category_mappings["previous_qualification"].get(x, f"Unknown ({x})")
-                )
-                
-                previous_qualification_grade = st.slider("Previous Qualification Grade", 95.0, 200.0, 130.0, 0.5)
-                admission_grade = st.slider("Admission Grade", 95.0, 190.0, 125.0, 0.5)
-                
-                application_mode_options = list(category_mappings["application_mode"].items())
-                application_mode = st.selectbox(
-                    "Application Mode", 
-                    options=[mode[0] for mode in application_mode_options],
-                    format_func=lambda x: category_mappings["application_mode"].get(x, f"Unknown ({x})")
-                )
-                
-                application_order = st.slider("Application Preference Order", 1, 6, 1)
-                
-                course_options = list(category_mappings["course"].items())
-                course = st.selectbox(
-                    "Course", 
-                    options=[c[0] for c in course_options],
-                    format_func=lambda x: category_mappings["course"].get(x, f"Unknown ({x})")
-                )
-                
-                daytime_evening_attendance = st.radio("Attendance Time", [0, 1], format_func=lambda x: "Daytime" if x == 0 else "Evening")
-            
-            with col2:
-                mothers_qualification = st.selectbox(
-                    "Mother's Qualification", 
-                    options=list(category_mappings["education_level"].keys()),
-                    format_func=lambda x: category_mappings["education_level"].get(x, f"Unknown ({x})")
-                )
-                
-                fathers_qualification = st.selectbox(
-                    "Father's Qualification", 
-                    options=list(category_mappings["education_level"].keys()),
-                    format_func=lambda x: category_mappings["education_level"].get(x, f"Unknown ({x})")
-                )
-                
-                mothers_occupation = st.selectbox(
-                    "Mother's Occupation", 
-                    options=list(category_mappings["occupation"].keys()),
-                    format_func=lambda x: category_mappings["occupation"].get(x, f"Unknown ({x})")
-                )
-                
-                fathers_occupation = st.selectbox(
-                    "Father's Occupation", 
-                    options=list(category_mappings["occupation"].keys()),
-                    format_func=lambda x: category_mappings["occupation"].get(x, f"Unknown ({x})")
-                )
-            
-            st.subheader("Academic Performance (1st Semester)")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                curricular_units_1st_sem_credited = st.slider("Curricular Units Credited (1st Sem)", 0, 20, 0)
-                curricular_units_1st_sem_enrolled = st.slider("Curricular Units Enrolled (1st Sem)", 0, 20, 6)
-                curricular_units_1st_sem_evaluations = st.slider("Curricular Units Evaluations (1st Sem)", 0, 25, 6)
-            
-            with col2:
-                curricular_units_1st_sem_approved = st.slider("Curricular Units Approved (1st Sem)", 0, 20, 5)
-                curricular_units_1st_sem_grade = st.slider("Average Grade (1st Sem)", 0.0, 20.0, 13.0, 0.1)
-                curricular_units_1st_sem_without_evaluations = st.slider("Units Without Evaluations (1st Sem)", 0, 10, 0)
-            
-            st.subheader("Academic Performance (2nd Semester)")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                curricular_units_2nd_sem_credited = st.slider("Curricular Units Credited (2nd Sem)", 0, 20, 0)
-                curricular_units_2nd_sem_enrolled = st.slider("Curricular Units Enrolled (2nd Sem)", 0, 20, 6)
-                curricular_units_2nd_sem_evaluations = st.slider("Curricular Units Evaluations (2nd Sem)", 0, 25, 6)
-            
-            with col2:
-                curricular_units_2nd_sem_approved = st.slider("Curricular Units Approved (2nd Sem)", 0, 20, 5)
-                curricular_units_2nd_sem_grade = st.slider("Average Grade (2nd Sem)", 0.0, 20.0, 13.0, 0.1)
-                curricular_units_2nd_sem_without_evaluations = st.slider("Units Without Evaluations (2nd Sem)", 0, 12, 0)
-            
-            st.subheader("Economic Context")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                unemployment_rate = st.slider("Unemployment Rate", 7.0, 17.0, 10.8, 0.1)
-            
-            with col2:
-                inflation_rate = st.slider("Inflation Rate", -1.0, 4.0, 1.4, 0.1)
-            
-            with col3:
-                gdp = st.slider("GDP", -5.0, 4.0, 1.0, 0.01)
-            
-            # Submit button
-            submit_button = st.form_submit_button("Predict")
-            
-            if submit_button:
-                # Create features dictionary
-                features = {
-                    'Marital_status': marital_status,
-                    'Application_mode': application_mode,
-                    'Application_order': application_order,
-                    'Course': course,
-                    'Daytime_evening_attendance': daytime_evening_attendance,
-                    'Previous_qualification': previous_qualification,
-                    'Previous_qualification_grade': previous_qualification_grade,
-                    'Nacionality': nationality,
-                    'Mothers_qualification': mothers_qualification,
-                    'Fathers_qualification': fathers_qualification,
-                    'Mothers_occupation': mothers_occupation,
-                    'Fathers_occupation': fathers_occupation,
-                    'Admission_grade': admission_grade,
-                    'Displaced': int(displaced),
-                    'Educational_special_needs': int(educational_special_needs),
-                    'Debtor': int(debtor),
-                    'Tuition_fees_up_to_date': int(tuition_fees_up_to_date),
-                    'Gender': gender,
-                    'Scholarship_holder': int(scholarship_holder),
-                    'Age_at_enrollment': age_at_enrollment,
-                    'International': int(international),
-                    'Curricular_units_1st_sem_credited': curricular_units_1st_sem_credited,
-                    'Curricular_units_1st_sem_enrolled': curricular_units_1st_sem_enrolled,
-                    'Curricular_units_1st_sem_evaluations': curricular_units_1st_sem_evaluations,
-                    'Curricular_units_1st_sem_approved': curricular_units_1st_sem_approved,
-                    'Curricular_units_1st_sem_grade': curricular_units_1st_sem_grade,
-                    'Curricular_units_1st_sem_without_evaluations': curricular_units_1st_sem_without_evaluations,
-                    'Curricular_units_2nd_sem_credited': curricular_units_2nd_sem_credited,
-                    'Curricular_units_2nd_sem_enrolled': curricular_units_2nd_sem_enrolled,
-                    'Curricular_units_2nd_sem_evaluations': curricular_units_2nd_sem_evaluations,
-                    'Curricular_units_2nd_sem_approved': curricular_units_2nd_sem_approved,
-                    'Curricular_units_2nd_sem_grade': curricular_units_2nd_sem_grade,
-                    'Curricular_units_2nd_sem_without_evaluations': curricular_units_2nd_sem_without_evaluations,
-                    'Unemployment_rate': unemployment_rate,
-                    'Inflation_rate': inflation_rate,
-                    'GDP': gdp
-                }
-                
-                # Make prediction
-                prediction, probability = predict_dropout(features, model, scaler)
-                
-                # Convert numpy float32 to Python float to avoid Streamlit error
-                probability = [float(p) for p in probability]
-                
-                # Store results in session state
-                st.session_state.prediction_result = int(prediction)
-                st.session_state.prediction_probability = probability
-                st.session_state.student_data = features
-                st.session_state.show_intervention = False
-                
-                # Display prediction
-                st.subheader("Prediction Result")
-                
-                # Create columns for the prediction display
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if prediction == 0:
-                        st.error("⚠️ High Risk of Dropout")
-                        st.write(f"Probability: {probability[0]:.2%}")
-                    else:
-                        st.success("🎓 Likely to Graduate")
-                        st.write(f"Probability: {probability[1]:.2%}")
-                
-                with col2:
-                    # Create a progress bar for the confidence
-                    if prediction == 0:
-                        st.write("Dropout Probability:")
-                        st.progress(probability[0])
-                        st.write("Graduation Probability:")
-                        st.progress(probability[1])
-                    else:
-                        st.write("Graduation Probability:")
-                        st.progress(probability[1])
-                        st.write("Dropout Probability:")
-                        st.progress(probability[0])
-                
-                # Display risk factors if high dropout risk
-                if prediction == 0 and probability[0] > 0.7:
-                    st.subheader("Potential Risk Factors")
-                    risk_factors = []
-                    
-                    # Check for risk factors based on the input
-                    if curricular_units_1st_sem_approved / max(curricular_units_1st_sem_enrolled, 1) < 0.5:
-                        risk_factors.append("Low pass rate in 1st semester courses")
-                    
-                    if curricular_units_2nd_sem_approved / max(curricular_units_2nd_sem_enrolled, 1) < 0.5:
-                        risk_factors.append("Low pass rate in 2nd semester courses")
-                        
-                    if curricular_units_1st_sem_grade < 11:
-                        risk_factors.append("Below average grades in 1st semester")
-                        
-                    if curricular_units_2nd_sem_grade < 11:
-                        risk_factors.append("Below average grades in 2nd semester")
-                        
-                    if debtor == 1:
-                        risk_factors.append("Has tuition debt")
-                        
-                    if tuition_fees_up_to_date == 0:
-                        risk_factors.append("Tuition fees not up to date")
-                    
-                    # Display risk factors as a bulleted list
-                    if risk_factors:
-                        for factor in risk_factors:
-                            st.write(f"• {factor}")
-                    else:
-                        st.write("No specific risk factors identified, but the combination of various attributes indicates dropout risk.")
-                
-                # Display potential interventions if high dropout risk
-                if prediction == 0 and probability[0] > 0.6:
-                    st.subheader("Recommended Interventions")
-                    
-                    # Create a container with custom styling for recommendations
-                    recommendation_container = st.container()
-                    with recommendation_container:
-                        st.markdown("""
-                        <style>
-                        .recommendation-box {
-                            background-color: transparent;
-                            border-left: 3px solid #27AE60;
-                            padding: 12px 18px;
-                            margin-bottom: 12px;
-                            border-radius: 0;
-                        }
-
-                        .recommendation-title {
-                            color: #ECF0F1;
-                            font-weight: 600;
-                            font-size: 17px;
-                            margin-bottom: 4px;
-                        }
-
-                        .recommendation-desc {
-                            color: #BDC3C7;
-                            font-size: 14px;
-                            line-height: 1.5;
-                        }
-                        .recommendation-container {
-                            background-color: #2C3E50;
-                            padding: 20px;
-                            border-radius: 8px;
-                            margin-bottom: 20px;
-                        }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
-                        recommendations = [
-                            {
-                                "title": "Academic Advising",
-                                "description": "Schedule a meeting with an academic advisor to discuss course progress and create a structured study plan."
-                            },
-                            {
-                                "title": "Tutoring Services",
-                                "description": "Connect with the tutoring center for additional academic support in challenging subjects."
-                            },
-                            {
-                                "title": "Financial Assistance",
-                                "description": "Meet with the financial aid office to explore scholarship options, payment plans, or emergency funding."
-                            },
-                            {
-                                "title": "Regular Check-ins",
-                                "description": "Establish bi-weekly check-ins with a faculty mentor to track progress and address concerns early."
-                            },
-                            {
-                                "title": "Study Skills Workshop",
-                                "description": "Attend workshops on time management, note-taking, and effective study techniques."
-                            }
-                        ]
-                        
-                        for rec in recommendations:
-                            st.markdown(f"""
-                            <div class="recommendation-box">
-                                <div class="recommendation-title">{rec["title"]}</div>
-                                <div class="recommendation-desc">{rec["description"]}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown("---")
-        
-        # Generate Intervention Plan button with functionality
-        if st.session_state.prediction_result is not None:
-            intervention_button = st.button(
-                "Generate Intervention Plan", 
-                help="Generate a detailed intervention plan for this student",
-                key="intervention_button"
-            )
-            
-            if intervention_button:
-                st.session_state.show_intervention = True
-            
-            # Display intervention plan if button was clicked
-            if st.session_state.show_intervention:
-                # For dropout prediction, use dropout probability; for graduation, use (1-graduation probability)
-                if st.session_state.prediction_result == 0:
-                    dropout_prob = st.session_state.prediction_probability[0]
-                else:
-                    dropout_prob = st.session_state.prediction_probability[0]  # Already the dropout probability
-                
-                generate_intervention_plan(
-                    st.session_state.student_data, 
-                    st.session_state.prediction_result,
-                    dropout_prob
-                )
-        
-        year = pd.to_datetime("today").year
+        year = datetime.date.today().year
         name = "[Moh. Wahyu Abrory](http://linkedin.com/in/wahyuabrory 'Moh. Wahyu Abrory | LinkedIn')"
         copyright = 'Copyright © ' + str(year) + ' ' + name
         st.caption(copyright)
 
     
+    with tab_insights:
+        show_model_insights(get_model_insights(artifact_fingerprint(INSIGHTS_PATH, MODEL_PATH)))
+    
     with tab2:
-        st.subheader("About this Prediction System")
-        st.write("""
-        ### Model Information
-        This prediction system uses an XGBoost machine learning model trained on historical student data 
-        to predict whether a student is likely to drop out or graduate. The model analyzes various factors 
-        including personal information, academic performance, and socioeconomic indicators.
-        
-        ### Features Used
-        - **Personal Information**: Age, gender, marital status, nationality
-        - **Academic Background**: Previous qualification, admission grades
-        - **Family Background**: Parents' education and occupation
-        - **Financial Factors**: Scholarship status, tuition payment status
-        - **Academic Performance**: Course units, grades for multiple semesters
-        - **Economic Context**: Unemployment rate, inflation rate, GDP
-        
-        ### Interpretation
-        The model provides a probability score indicating how likely a student is to drop out or graduate.
-        Higher dropout probability suggests greater risk that requires intervention.
-        
-        ### Disclaimer
-        This tool is meant to be used as a screening mechanism to identify students who might benefit from 
-        additional support. It should not be used as the sole decision-making factor for academic interventions.
-        """)
-        
-        st.subheader("Dataset")
-        st.write("""
-        The model was trained using a dataset containing anonymized student records with various 
-        attributes and their eventual academic outcomes (dropout or graduation).
-        """)
+        show_about()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with instrument.rerun():
+        main()
+    show_debug_panel()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""Benchmarks for the prediction and app rendering hot paths.
+
+Uses data/encoded_data.csv as the workload and writes machine-readable JSON:
+
+    python -m dropout.bench run -o bench.json
+    python -m dropout.bench compare baseline.json bench.json --tolerance 0.10
+
+`compare` exits non-zero when any metric got worse by more than the
+tolerance, so it can gate a change in CI.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH, FEATURE_NAMES, ROOT
+from dropout.scoring import BACKENDS
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+
+# Changes smaller than this are treated as timer noise, whatever the ratio
+NOISE_FLOOR = {'ms': 0.05, 's': 0.01, 'MB': 1.0}
+
+# Runs in a fresh interpreter so imports and artifact loads are truly cold
+COLD_START_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from dropout.scoring import load_backend_model, load_backend_scaler
+imported = time.perf_counter()
+load_backend_model(sys.argv[1])
+model_loaded = time.perf_counter()
+load_backend_scaler(sys.argv[1])
+scaler_loaded = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'load_model_s': model_loaded - imported,
+    'get_scaler_s': scaler_loaded - model_loaded,
+    'total_s': scaler_loaded - start,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def metric(value, unit, better='lower'):
+    return {'value': float(value), 'unit': unit, 'better': better}
+
+
+def timings(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    return samples
+
+
+def distribution(prefix, samples):
+    ms = samples * 1000
+    return {
+        f'{prefix}.p50_ms': metric(np.percentile(ms, 50), 'ms'),
+        f'{prefix}.p90_ms': metric(np.percentile(ms, 90), 'ms'),
+        f'{prefix}.p99_ms': metric(np.percentile(ms, 99), 'ms'),
+        f'{prefix}.mean_ms': metric(ms.mean(), 'ms'),
+    }
+
+
+def import_app():
+    """Import app.py outside `streamlit run` (Streamlit's bare mode)"""
+    import streamlit.config
+    import streamlit.logger
+
+    # Parse the config first (it resets the log level), then silence the
+    # "missing ScriptRunContext" warning every st.* call logs in bare mode
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+    sys.path.insert(0, str(ROOT))
+    import app
+
+    return app
+
+
+def bench_cold_start(backend):
+    out = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', COLD_START_SCRIPT, backend],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    prefix = f'cold_start.{backend}'
+    return {
+        f'{prefix}.import_s': metric(result['import_s'], 's'),
+        f'{prefix}.load_model_s': metric(result['load_model_s'], 's'),
+        f'{prefix}.get_scaler_s': metric(result['get_scaler_s'], 's'),
+        f'{prefix}.total_s': metric(result['total_s'], 's'),
+        f'{prefix}.peak_rss_mb': metric(result['peak_rss_mb'], 'MB'),
+    }
+
+
+def bench_single_row(app, model, scaler, rows, repeat):
+    """Latency distribution of predict_dropout over real student rows"""
+    it = itertools.count()
+    return distribution(
+        'predict_dropout',
+        timings(lambda: app.predict_dropout(rows[next(it) % len(rows)], model, scaler), repeat),
+    )
+
+
+def bench_batches(model, scaler, X, sizes, min_time=0.5):
+    from dropout.scoring import predict_batch
+
+    results = {}
+    for size in sizes:
+        batch = np.resize(X, (size, X.shape[1]))
+        calls, start = 0, time.perf_counter()
+        while True:
+            predict_batch(batch, model, scaler)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        results[f'batch.{size}.rows_per_s'] = metric(calls * size / elapsed, 'rows/s', 'higher')
+    return results
+
+
+def bench_memory(model, scaler, X, size=100_000):
+    """Python heap high-water mark of scoring one large batch"""
+    from dropout.scoring import predict_batch
+
+    batch = np.resize(X, (size, X.shape[1]))
+    tracemalloc.start()
+    predict_batch(batch, model, scaler)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        f'memory.batch_{size}.traced_peak_mb': metric(peak / 2**20, 'MB'),
+        'memory.process_peak_rss_mb': metric(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 'MB'),
+    }
+
+
+def bench_app(app, rows, repeat):
+    results = {}
+    results.update(distribution(
+        'get_category_mappings.uncached',
+        timings(lambda: (app.get_category_mappings.clear(), app.get_category_mappings()), repeat),
+    ))
+    results.update(distribution('get_category_mappings.cached', timings(app.get_category_mappings, repeat)))
+
+    it = itertools.count()
+
+    def plan():
+        student = rows[next(it) % len(rows)]
+        app.generate_intervention_plan(student, 0, 0.85)
+
+    results.update(distribution('generate_intervention_plan', timings(plan, repeat)))
+    return results
+
+
+def run(backend='joblib', repeat=300, sizes=BATCH_SIZES, data_path=ENCODED_DATA_PATH):
+    import pandas as pd
+
+    df = pd.read_csv(data_path)
+    X = df[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    rows = df[FEATURE_NAMES].to_dict('records')
+
+    metrics = {}
+    for name in BACKENDS:
+        metrics.update(bench_cold_start(name))
+
+    app = import_app()
+    from dropout.scoring import load_pipeline
+    model, scaler = load_pipeline(backend)
+
+    metrics.update(bench_single_row(app, model, scaler, rows, repeat))
+    metrics.update(bench_batches(model, scaler, X, sizes))
+    metrics.update(bench_app(app, rows, repeat))
+    metrics.update(bench_memory(model, scaler, X))
+
+    return {
+        'meta': {
+            'backend': backend,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'rows': len(X),
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'metrics': metrics,
+    }
+
+
+def compare(baseline, candidate, tolerance=0.10):
+    """Return per-metric changes and the names of regressed metrics"""
+    rows, regressions = [], []
+    for name, base in baseline['metrics'].items():
+        new = candidate['metrics'].get(name)
+        if new is None or base['value'] == 0:
+            continue
+        delta = new['value'] - base['value']
+        change = delta / abs(base['value'])
+        worse = change > tolerance if base['better'] == 'lower' else change < -tolerance
+        worse = worse and abs(delta) >= NOISE_FLOOR.get(base['unit'], 0.0)
+        rows.append((name, base['value'], new['value'], change, base['unit'], worse))
+        if worse:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction and rendering hot paths")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help="run the benchmarks and write JSON results")
+    run_parser.add_argument('-o', '--output', default='bench.json')
+    run_parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    run_parser.add_argument('--repeat', type=int, default=300, help="samples per latency distribution")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(BATCH_SIZES), help="batch sizes")
+
+    cmp_parser = sub.add_parser('compare', help="flag regressions between two result files")
+    cmp_parser.add_argument('baseline')
+    cmp_parser.add_argument('candidate')
+    cmp_parser.add_argument('--tolerance', type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.backend, args.repeat, args.sizes)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        for name, m in results['metrics'].items():
+            print(f"{name:55s} {m['value']:>14,.3f} {m['unit']}")
+        print(f"Wrote {args.output}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    rows, regressions = compare(baseline, candidate, args.tolerance)
+    for name, old, new, change, unit, worse in rows:
+        flag = 'REGRESSION' if worse else ''
+        print(f"{name:55s} {old:>12,.3f} -> {new:>12,.3f} {unit:6s} {change:+7.1%} {flag}")
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == '__main__':
+    main()
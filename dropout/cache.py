@@ -0,0 +1,103 @@
+"""LRU/TTL cache for single-student predictions.
+
+Entries are keyed by a canonical hash of the 36-feature dict and tagged with
+the fingerprint of the model and preprocessing files, so replacing either
+artifact on disk empties the cache on the next lookup.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+from dropout.features import (
+    COMPILED_MODEL_PATH, FEATURE_NAMES, FOLDED_MODEL_PATH, MODEL_PATH, PREPROCESSING_PATH
+)
+
+DEFAULT_MAXSIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 4096))
+DEFAULT_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+
+
+def artifact_fingerprint(*paths):
+    """Cheap (path, size, mtime) fingerprint of the serving artifacts"""
+    paths = paths or (MODEL_PATH, PREPROCESSING_PATH, FOLDED_MODEL_PATH, COMPILED_MODEL_PATH)
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((str(path), stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            fingerprint.append((str(path), None, None))
+    return tuple(fingerprint)
+
+
+def feature_key(features, precision=6):
+    """Canonical hash of a feature dict
+
+    Values are read in training order and rounded, so int/float spelling
+    (1 vs 1.0) and float noise from sliders map to the same key.
+    """
+    values = [round(float(features[name]), precision) for name in FEATURE_NAMES]
+    return hashlib.sha1(json.dumps(values).encode()).hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._fingerprint = None
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_fingerprint(self, fingerprint):
+        if fingerprint != self._fingerprint:
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, features, fingerprint=None):
+        key = feature_key(features)
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, features, value, fingerprint=None):
+        key = feature_key(features)
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,152 @@
+"""Precomputed cohort statistics for peer comparisons.
+
+For the whole dataset, each Course and each Application_mode, the index
+stores the dropout rate and, per compared metric, the sorted distinct
+values with cumulative counts. A student's percentile rank within a segment
+is then two binary searches, without touching the dataset:
+
+    python -m dropout.cohort            # writes model/cohort_index.npz
+
+The index records the SHA-256 of the data it was built from; rebuild it
+whenever the dataset changes.
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from dropout.features import COHORT_INDEX_PATH, ENCODED_DATA_PATH, STATUS_CODES, TARGET
+
+INDEX_VERSION = 1
+
+# Columns students are ranked on
+METRICS = [
+    'Admission_grade',
+    'Curricular_units_1st_sem_grade',
+    'Curricular_units_2nd_sem_grade',
+    'Curricular_units_1st_sem_approved',
+    'Curricular_units_2nd_sem_approved',
+]
+
+# Columns whose values define peer segments
+SEGMENT_COLUMNS = ['Course', 'Application_mode']
+
+# Segments smaller than this are left out, their percentiles would be noise
+MIN_SEGMENT_SIZE = 10
+
+
+def segment_key(column=None, value=None):
+    return 'all' if column is None else f'{column}={int(value)}'
+
+
+class CohortIndex:
+    """Percentile ranks and dropout rates looked up from the prebuilt arrays"""
+
+    def __init__(self, values, cumulative, meta):
+        self.values = values
+        self.cumulative = cumulative
+        self.meta = meta
+
+    def __contains__(self, segment):
+        return segment in self.meta['segments']
+
+    def rows(self, segment):
+        return self.meta['segments'][segment]['rows']
+
+    def dropout_rate(self, segment):
+        return self.meta['segments'][segment]['dropout_rate']
+
+    def percentile(self, segment, metric, value):
+        """Mid-rank percentile (0-100) of value within the segment, None if unknown"""
+        info = self.meta['segments'].get(segment)
+        if info is None:
+            return None
+        start, stop = info['metrics'][metric]
+        values = self.values[start:stop]
+        cumulative = self.cumulative[start:stop]
+        left = np.searchsorted(values, value, side='left')
+        right = np.searchsorted(values, value, side='right')
+        below = cumulative[left - 1] if left else 0
+        at_or_below = cumulative[right - 1] if right else 0
+        return float(100.0 * (below + at_or_below) / 2 / info['rows'])
+
+    def compare(self, features):
+        """Percentiles of the student's metrics overall and within their segments"""
+        segments = {'all': 'all'}
+        for column in SEGMENT_COLUMNS:
+            segments[column] = segment_key(column, features[column])
+        return {
+            'segments': {name: key if key in self else None for name, key in segments.items()},
+            'percentiles': {
+                metric: {
+                    name: self.percentile(key, metric, float(features[metric])) if key in self else None
+                    for name, key in segments.items()
+                }
+                for metric in METRICS
+            },
+        }
+
+
+def build_index(data_path=ENCODED_DATA_PATH):
+    """Sorted distinct values and cumulative counts per segment and metric"""
+    from dropout.preprocessing import load_training_frame
+
+    df, data_sha256 = load_training_frame(data_path)
+    segments = [('all', df)]
+    for column in SEGMENT_COLUMNS:
+        for value, group in df.groupby(column, sort=True):
+            if len(group) >= MIN_SEGMENT_SIZE:
+                segments.append((segment_key(column, value), group))
+
+    values, cumulative, meta_segments, offset = [], [], {}, 0
+    for key, group in segments:
+        info = {
+            'rows': len(group),
+            'dropout_rate': float((group[TARGET] == STATUS_CODES['Dropout']).mean()),
+            'metrics': {},
+        }
+        for metric in METRICS:
+            distinct, counts = np.unique(group[metric].to_numpy(dtype=np.float64), return_counts=True)
+            values.append(distinct)
+            cumulative.append(np.cumsum(counts))
+            info['metrics'][metric] = [offset, offset + len(distinct)]
+            offset += len(distinct)
+        meta_segments[key] = info
+
+    meta = {
+        'version': INDEX_VERSION,
+        'metrics': METRICS,
+        'segment_columns': SEGMENT_COLUMNS,
+        'data_sha256': data_sha256,
+        'segments': meta_segments,
+    }
+    return CohortIndex(np.concatenate(values), np.concatenate(cumulative).astype(np.int64), meta)
+
+
+def save_index(index, path=COHORT_INDEX_PATH):
+    np.savez_compressed(path, values=index.values, cumulative=index.cumulative, meta=json.dumps(index.meta))
+
+
+def load_index(path=COHORT_INDEX_PATH):
+    with np.load(path) as data:
+        meta = json.loads(str(data['meta']))
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported cohort index version {meta.get('version')!r}, expected {INDEX_VERSION}")
+        return CohortIndex(data['values'], data['cumulative'], meta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the cohort percentile index used by the app")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="encoded CSV or columnar directory")
+    parser.add_argument('-o', '--output', default=COHORT_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    index = build_index(args.data)
+    save_index(index, args.output)
+    print(f"Wrote {args.output}: {len(index.meta['segments'])} segments, {len(index.values):,} distinct values "
+          f"(data sha256 {index.meta['data_sha256'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
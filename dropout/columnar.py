@@ -0,0 +1,171 @@
+"""Typed columnar copy of the student datasets with memory-mapped loading.
+
+A CSV (raw ';' or encoded ',') is converted once into a directory holding
+a float64 feature matrix in training column order, the encoded Status
+vector and a small metadata file:
+
+    data/encoded/features.npy
+    data/encoded/status.npy
+    data/encoded/meta.json
+
+Loading memory-maps the .npy files, so nothing is parsed or copied up front
+and worker processes that map the same file share its pages.
+
+    python -m dropout.columnar data/data.csv -o data/encoded
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH, FEATURE_NAMES, ROOT, TARGET
+from dropout.preprocessing import file_checksum
+
+COLUMNAR_PATH = ROOT / 'data' / 'encoded'
+COLUMNAR_VERSION = 1
+
+
+class ColumnarDataset:
+    """Memory-mapped feature matrix, optional Status vector and metadata"""
+
+    def __init__(self, X, status, meta):
+        self.X = X
+        self.status = status
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.X)
+
+    def to_frame(self, source_dtypes=False):
+        """DataFrame view with the feature columns (and Status if present)
+
+        The features stay a zero-copy float64 view unless source_dtypes is
+        set, which casts columns that were integers in the CSV back to int64
+        (SMOTE rounds synthetic samples of integer columns, so training needs
+        the original dtypes to reproduce the CSV pipeline).
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self.X, columns=FEATURE_NAMES, copy=False)
+        if source_dtypes:
+            df = df.astype({name: np.int64 for name in self.meta['integer_columns']})
+        if self.status is not None:
+            df[TARGET] = self.status
+        return df
+
+
+def is_columnar(path):
+    return Path(path).is_dir() and (Path(path) / 'meta.json').exists()
+
+
+def count_rows(path):
+    """Upper bound on the data rows: blank lines and quoted newlines count too"""
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f) - 1
+
+
+def truncate_rows(path, rows):
+    """Rewrite a .npy file keeping only its first rows"""
+    path = Path(path)
+    src = np.load(path, mmap_mode='r')
+    tmp = path.with_name(path.stem + '.tmp.npy')
+    dst = np.lib.format.open_memmap(tmp, mode='w+', dtype=src.dtype, shape=(rows, *src.shape[1:]))
+    dst[:] = src[:rows]
+    dst.flush()
+    del src, dst
+    os.replace(tmp, path)
+
+
+def convert(csv_path, output=COLUMNAR_PATH, chunk_size=50_000, sep=None):
+    """Stream a CSV into the columnar layout without loading it whole"""
+    from pandas.api.types import is_integer_dtype
+
+    from dropout.streaming import encode_chunk, iter_chunks
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    rows = count_rows(csv_path)
+
+    X = np.lib.format.open_memmap(output / 'features.npy', mode='w+', dtype=np.float64, shape=(rows, len(FEATURE_NAMES)))
+    status = None
+    written = 0
+    integer = set(FEATURE_NAMES)
+    for chunk, _ in iter_chunks(csv_path, chunk_size, sep, total_rows=rows):
+        chunk = encode_chunk(chunk)
+        integer &= {name for name in FEATURE_NAMES if is_integer_dtype(chunk[name])}
+        X[written:written + len(chunk)] = chunk[FEATURE_NAMES].to_numpy(dtype=np.float64)
+        if TARGET in chunk.columns:
+            if status is None:
+                status = np.lib.format.open_memmap(output / 'status.npy', mode='w+', dtype=np.int8, shape=(rows,))
+            status[written:written + len(chunk)] = chunk[TARGET].to_numpy(dtype=np.int8)
+        written += len(chunk)
+    X.flush()
+    if status is not None:
+        status.flush()
+    elif (output / 'status.npy').exists():
+        (output / 'status.npy').unlink()
+    has_status = status is not None
+    del X, status
+
+    # The line count overestimates rows when the CSV has blank lines or
+    # quoted newlines; drop the unwritten all-zero tail
+    if written < rows:
+        truncate_rows(output / 'features.npy', written)
+        if has_status:
+            truncate_rows(output / 'status.npy', written)
+
+    meta = {
+        'version': COLUMNAR_VERSION,
+        'rows': written,
+        'columns': FEATURE_NAMES,
+        'dtype': 'float64',
+        'integer_columns': [name for name in FEATURE_NAMES if name in integer],
+        'has_status': has_status,
+        'source': str(csv_path),
+        'source_sha256': file_checksum(csv_path),
+    }
+    with open(output / 'meta.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load(path=COLUMNAR_PATH, mmap=True):
+    """Open a converted dataset, memory-mapped read-only by default"""
+    path = Path(path)
+    with open(path / 'meta.json') as f:
+        meta = json.load(f)
+    if meta.get('version') != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar dataset version {meta.get('version')!r}, expected {COLUMNAR_VERSION}")
+    if meta['columns'] != FEATURE_NAMES:
+        raise ValueError(f"Columnar dataset {path} column order does not match FEATURE_NAMES")
+
+    mode = 'r' if mmap else None
+    X = np.load(path / 'features.npy', mmap_mode=mode)
+    status = np.load(path / 'status.npy', mmap_mode=mode) if meta['has_status'] else None
+    if len(X) != meta['rows'] or (status is not None and len(status) != meta['rows']):
+        raise ValueError(f"Columnar dataset {path} holds {len(X):,} rows but its metadata records {meta['rows']:,}, "
+                         "convert the CSV again")
+    return ColumnarDataset(X, status, meta)
+
+
+def load_frame(path=COLUMNAR_PATH):
+    return load(path).to_frame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a student CSV to the memory-mappable columnar layout")
+    parser.add_argument('input', nargs='?', default=ENCODED_DATA_PATH, help="raw (';') or encoded (',') CSV")
+    parser.add_argument('-o', '--output', default=COLUMNAR_PATH, help="directory to write")
+    parser.add_argument('--sep', default=None, help="CSV delimiter, detected from the header by default")
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    meta = convert(args.input, args.output, args.chunk_size, args.sep)
+    print(f"Wrote {meta['rows']:,} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
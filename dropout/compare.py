@@ -0,0 +1,197 @@
+"""Parallel comparison of the notebook's candidate classifiers.
+
+The resampled, scaled training split and the test split are written once
+to .npy files that every worker maps read-only, and each candidate is fit
+in its own fresh process, so candidates run side by side. Memory is the
+worker's current RSS sampled during fit and predict, since ru_maxrss
+carries the parent's high-water mark across fork and exec. Alongside the notebook's accuracy,
+precision, recall and F1 the leaderboard records fit time, batch and
+single-row predict time, peak memory and pickled model size:
+
+    python -m dropout.compare --workers 4 -o leaderboard.csv
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH
+from dropout.resample import STRATEGIES
+
+SEED = 42
+
+
+def candidates():
+    """The notebook's `models` dict, as factories so workers build their own"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+    from xgboost import XGBClassifier
+
+    return {
+        'Logistic Regression': lambda: LogisticRegression(class_weight='balanced', random_state=SEED),
+        'SVC': lambda: SVC(probability=True, class_weight='balanced', random_state=SEED),
+        'Decision Tree': lambda: DecisionTreeClassifier(class_weight='balanced', random_state=SEED),
+        'Random Forest': lambda: RandomForestClassifier(class_weight='balanced', random_state=SEED),
+        'Gradient Boosting': lambda: GradientBoostingClassifier(random_state=SEED),
+        'XGBoost': lambda: XGBClassifier(random_state=SEED, eval_metric='logloss'),
+        'KNN': lambda: KNeighborsClassifier(n_neighbors=5),
+        'Naive Bayes': lambda: GaussianNB(),
+    }
+
+
+CANDIDATES = ('Logistic Regression', 'SVC', 'Decision Tree', 'Random Forest',
+              'Gradient Boosting', 'XGBoost', 'KNN', 'Naive Bayes')
+
+
+def prepare_arrays(directory, data_path=ENCODED_DATA_PATH, strategy='smote'):
+    """Write the scaled train/test arrays as .npy files for the workers to map"""
+    from dropout.preprocessing import fit_scaler, load_training_frame, split_training_data
+    from dropout.resample import resample
+
+    df, _ = load_training_frame(data_path)
+    X_train, X_test, y_train, y_test = split_training_data(df)
+    X_train, y_train, _ = resample(X_train, y_train, strategy, SEED)
+    scaler = fit_scaler(X_train)
+    arrays = {
+        'X_train': scaler.transform(X_train),
+        'y_train': np.asarray(y_train, dtype=np.int64),
+        'X_test': scaler.transform(X_test),
+        'y_test': np.asarray(y_test, dtype=np.int64),
+    }
+    for name, values in arrays.items():
+        np.save(Path(directory) / f'{name}.npy', values)
+
+
+def current_rss():
+    """Resident set size of this process in bytes, None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Peak current RSS while the block runs, sampled from a background thread"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.baseline = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self.baseline = self.peak = current_rss()
+        if self.baseline is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.baseline is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, current_rss())
+
+
+def _evaluate(name, directory, single_rows=200):
+    """Fit and time one candidate, runs in a fresh worker process"""
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    arrays = {
+        key: np.load(Path(directory) / f'{key}.npy', mmap_mode='r')
+        for key in ('X_train', 'y_train', 'X_test', 'y_test')
+    }
+    model = candidates()[name]()
+    # One thread per model, the pool provides the parallelism and timings stay comparable
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+
+    with RssSampler() as memory:
+        start = time.perf_counter()
+        model.fit(arrays['X_train'], arrays['y_train'])
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(arrays['X_test'])
+        model.predict_proba(arrays['X_test'])
+        predict_s = time.perf_counter() - start
+
+    rows = np.asarray(arrays['X_test'][:single_rows])
+    samples = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict_proba(row.reshape(1, -1))
+        samples.append(time.perf_counter() - start)
+
+    y_test = arrays['y_test']
+    return {
+        'model': name,
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+        'fit_s': fit_s,
+        'predict_test_s': predict_s,
+        'single_row_p50_ms': float(np.percentile(samples, 50) * 1000),
+        'single_row_p99_ms': float(np.percentile(samples, 99) * 1000),
+        'peak_rss_mb': memory.peak / 2**20 if memory.peak is not None else None,
+        'fit_rss_growth_mb': (memory.peak - memory.baseline) / 2**20 if memory.peak is not None else None,
+        'model_size_kb': len(pickle.dumps(model)) / 1024,
+    }
+
+
+def compare(names=CANDIDATES, workers=None, data_path=ENCODED_DATA_PATH, strategy='smote'):
+    """Evaluate the candidates across a process pool, best F1 first"""
+    import pandas as pd
+
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    with tempfile.TemporaryDirectory(prefix='dropout-compare-') as directory:
+        prepare_arrays(directory, data_path, strategy)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context('spawn'), max_tasks_per_child=1,
+        ) as pool:
+            results = list(pool.map(_evaluate, names, [directory] * len(names)))
+    return pd.DataFrame(results).sort_values('f1', ascending=False).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the candidate classifiers on accuracy and inference cost")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="encoded training CSV or columnar directory")
+    parser.add_argument('--models', nargs='+', choices=CANDIDATES, default=list(CANDIDATES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument('--resample', choices=STRATEGIES, default='smote', help="class-imbalance strategy")
+    parser.add_argument('-o', '--output', default='leaderboard.csv', help="CSV or JSON leaderboard to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    leaderboard = compare(args.models, args.workers, args.data, args.resample)
+    if Path(args.output).suffix.lower() == '.json':
+        leaderboard.to_json(args.output, orient='records', indent=2)
+    else:
+        leaderboard.to_csv(args.output, index=False)
+
+    columns = ['model', 'f1', 'recall', 'accuracy', 'fit_s', 'single_row_p50_ms', 'peak_rss_mb',
+               'fit_rss_growth_mb', 'model_size_kb']
+    print(leaderboard[columns].to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+    print(f"\nEvaluated {len(leaderboard)} models in {time.perf_counter() - start:.1f}s, wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""Export the XGBoost model to a lightweight NumPy inference format.
+
+The booster's trees are flattened into padded node arrays and written with
+the preprocessing statistics into a single .npz file. CompiledModel walks all
+trees at once with NumPy, so scoring needs neither xgboost nor scikit-learn
+(importing xgboost alone pulls in both, plus pandas and scipy).
+
+    python -m dropout.export            # writes model/model_xgb.npz
+    python -m dropout.export --check    # parity and timing against the joblib model
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from dropout.features import COMPILED_MODEL_PATH, ENCODED_DATA_PATH, FEATURE_NAMES, MODEL_PATH, PREPROCESSING_PATH
+from dropout.preprocessing import file_checksum, load_bundle
+
+COMPILED_VERSION = 1
+PARITY_TOLERANCE = 1e-5
+
+
+def booster_trees(booster):
+    """Flatten the booster's JSON dump into (n_trees, max_nodes) arrays"""
+    trees = json.loads(booster.save_raw('json'))['learner']['gradient_booster']['model']['trees']
+    max_nodes = max(len(tree['left_children']) for tree in trees)
+    shape = (len(trees), max_nodes)
+
+    arrays = {
+        'feature': np.zeros(shape, dtype=np.int32),
+        'threshold': np.zeros(shape, dtype=np.float32),
+        'left': np.zeros(shape, dtype=np.int32),
+        'right': np.zeros(shape, dtype=np.int32),
+        'default_left': np.zeros(shape, dtype=bool),
+        'is_leaf': np.ones(shape, dtype=bool),
+        'value': np.zeros(shape, dtype=np.float32),
+    }
+    for t, tree in enumerate(trees):
+        left = np.asarray(tree['left_children'])
+        n = len(left)
+        leaf = left == -1
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        arrays['feature'][t, :n] = tree['split_indices']
+        arrays['threshold'][t, :n] = np.where(leaf, 0.0, conditions)
+        # Leaves point at themselves so extra traversal steps are no-ops
+        arrays['left'][t, :n] = np.where(leaf, np.arange(n), left)
+        arrays['right'][t, :n] = np.where(leaf, np.arange(n), tree['right_children'])
+        arrays['default_left'][t, :n] = np.asarray(tree['default_left'], dtype=bool)
+        arrays['is_leaf'][t, :n] = leaf
+        arrays['value'][t, :n] = np.where(leaf, conditions, 0.0)
+    return arrays
+
+
+def max_depth(arrays):
+    left, right, is_leaf = arrays['left'], arrays['right'], arrays['is_leaf']
+    depth = 0
+    frontier = [(t, 0, 0) for t in range(len(left))]
+    while frontier:
+        t, node, d = frontier.pop()
+        if is_leaf[t, node]:
+            depth = max(depth, d)
+        else:
+            frontier.append((t, left[t, node], d + 1))
+            frontier.append((t, right[t, node], d + 1))
+    return depth
+
+
+class CompiledModel:
+    """NumPy tree ensemble evaluator with an XGBClassifier-like interface
+
+    Takes raw (unscaled) features in FEATURE_NAMES order; scaling is applied
+    internally with the statistics stored alongside the trees.
+    """
+
+    def __init__(self, arrays, base_margin, depth, mean=None, scale=None, metadata=None):
+        self.arrays = arrays
+        self.base_margin = float(base_margin)
+        self.depth = int(depth)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float64)
+        self.metadata = metadata or {}
+        self._trees = np.arange(arrays['feature'].shape[0])
+
+    def predict_margin(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.mean is not None:
+            X = (X - self.mean) / self.scale
+        # xgboost compares features in float32
+        X = X.astype(np.float32)
+
+        a = self.arrays
+        rows = np.arange(len(X))[:, None]
+        node = np.zeros((len(X), len(self._trees)), dtype=np.int32)
+        for _ in range(self.depth):
+            feature = a['feature'][self._trees, node]
+            x = X[rows, feature]
+            go_left = np.where(np.isnan(x), a['default_left'][self._trees, node], x < a['threshold'][self._trees, node])
+            node = np.where(go_left, a['left'][self._trees, node], a['right'][self._trees, node])
+        return a['value'][self._trees, node].sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(np.int64)
+
+
+def compile_model(model, mean=None, scale=None, metadata=None):
+    """Build a CompiledModel from a fitted XGBClassifier"""
+    booster = model.get_booster()
+    arrays = booster_trees(booster)
+
+    # Recover the base margin by comparing the booster against the bare leaf sum
+    probe = np.zeros((1, len(FEATURE_NAMES)), dtype=np.float32)
+    bare = CompiledModel(arrays, 0.0, max_depth(arrays))
+    margin = model.predict(probe, output_margin=True)[0]
+    base_margin = float(margin) - float(bare.predict_margin(probe)[0])
+
+    return CompiledModel(arrays, base_margin, bare.depth, mean, scale, metadata)
+
+
+def save_compiled(compiled, path=COMPILED_MODEL_PATH):
+    np.savez(
+        path,
+        version=COMPILED_VERSION,
+        base_margin=compiled.base_margin,
+        depth=compiled.depth,
+        mean=compiled.mean if compiled.mean is not None else np.empty(0),
+        scale=compiled.scale if compiled.scale is not None else np.empty(0),
+        metadata=json.dumps(compiled.metadata),
+        **compiled.arrays,
+    )
+
+
+def load_compiled(path=COMPILED_MODEL_PATH, model_path=MODEL_PATH, verify=True):
+    """Load an exported model, checking that it came from the given model file"""
+    with np.load(path) as data:
+        if int(data['version']) != COMPILED_VERSION:
+            raise ValueError(f"Unsupported compiled model version {int(data['version'])}, expected {COMPILED_VERSION}")
+        arrays = {key: data[key] for key in ('feature', 'threshold', 'left', 'right', 'default_left', 'is_leaf', 'value')}
+        mean = data['mean'] if data['mean'].size else None
+        scale = data['scale'] if data['scale'].size else None
+        compiled = CompiledModel(
+            arrays, float(data['base_margin']), int(data['depth']), mean, scale,
+            json.loads(str(data['metadata'])),
+        )
+
+    if verify and model_path is not None and compiled.metadata.get('model_sha256') != file_checksum(model_path):
+        raise ValueError(
+            f"Compiled model {path} was exported from a different model than {model_path}; "
+            "re-export it with `python -m dropout.export`"
+        )
+    return compiled
+
+
+def export_model(model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH, output=COMPILED_MODEL_PATH):
+    from dropout.scoring import load_model
+
+    bundle = load_bundle(preprocessing_path, model_path)
+    compiled = compile_model(
+        load_model(model_path), bundle['mean'], bundle['scale'],
+        metadata={
+            'model_sha256': file_checksum(model_path),
+            'feature_names': FEATURE_NAMES,
+            'labels': bundle['labels'],
+        },
+    )
+    save_compiled(compiled, output)
+    return compiled
+
+
+def check_parity(compiled_path=COMPILED_MODEL_PATH, model_path=MODEL_PATH,
+                 preprocessing_path=PREPROCESSING_PATH, data_path=ENCODED_DATA_PATH):
+    """Compare the compiled model against the joblib pipeline and time both"""
+    import pandas as pd
+
+    X = pd.read_csv(data_path)[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    report = {}
+
+    start = time.perf_counter()
+    compiled = load_compiled(compiled_path, model_path)
+    report['compiled_load_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from dropout.preprocessing import load_scaler
+    from dropout.scoring import load_model
+    model = load_model(model_path)
+    scaler = load_scaler(preprocessing_path, model_path)
+    report['joblib_load_s'] = time.perf_counter() - start
+
+    expected = model.predict_proba(scaler.transform(X))
+    actual = compiled.predict_proba(X)
+    report['rows'] = len(X)
+    report['max_abs_diff'] = float(np.abs(expected - actual).max())
+    report['label_mismatches'] = int(((expected[:, 1] > 0.5) != (actual[:, 1] > 0.5)).sum())
+
+    row = X[:1]
+    for name, fn in (('joblib', lambda: model.predict_proba(scaler.transform(row))),
+                     ('compiled', lambda: compiled.predict_proba(row))):
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        report[f'{name}_row_ms'] = float(np.median(timings) * 1000)
+
+    report['ok'] = report['max_abs_diff'] <= PARITY_TOLERANCE and report['label_mismatches'] == 0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the model to the NumPy inference format")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--output', default=COMPILED_MODEL_PATH)
+    parser.add_argument('--check', action='store_true', help="verify parity against the joblib model instead of exporting")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="rows used for the parity check")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        report = check_parity(args.output, args.model, args.preprocessing, args.data)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report['ok'] else 1)
+
+    compiled = export_model(args.model, args.preprocessing, args.output)
+    print(f"Wrote {args.output} ({compiled.arrays['feature'].shape[0]} trees, depth {compiled.depth})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Feature layout, labels and default artifact paths."""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DATA_PATH = ROOT / 'data' / 'data.csv'
+ENCODED_DATA_PATH = ROOT / 'data' / 'encoded_data.csv'
+MODEL_PATH = ROOT / 'model' / 'model_xgb.joblib'
+PREPROCESSING_PATH = ROOT / 'model' / 'preprocessing.json'
+FOLDED_MODEL_PATH = ROOT / 'model' / 'model_xgb_folded.json'
+COMPILED_MODEL_PATH = ROOT / 'model' / 'model_xgb.npz'
+MANIFEST_PATH = ROOT / 'model' / 'model_xgb.manifest.json'
+COHORT_INDEX_PATH = ROOT / 'model' / 'cohort_index.npz'
+INSIGHTS_PATH = ROOT / 'model' / 'insights.json'
+
+TARGET = 'Status'
+
+# Column order the model was trained on
+FEATURE_NAMES = [
+    'Marital_status', 'Application_mode', 'Application_order', 'Course',
+    'Daytime_evening_attendance', 'Previous_qualification',
+    'Previous_qualification_grade', 'Nacionality', 'Mothers_qualification',
+    'Fathers_qualification', 'Mothers_occupation', 'Fathers_occupation',
+    'Admission_grade', 'Displaced', 'Educational_special_needs', 'Debtor',
+    'Tuition_fees_up_to_date', 'Gender', 'Scholarship_holder', 'Age_at_enrollment',
+    'International', 'Curricular_units_1st_sem_credited',
+    'Curricular_units_1st_sem_enrolled', 'Curricular_units_1st_sem_evaluations',
+    'Curricular_units_1st_sem_approved', 'Curricular_units_1st_sem_grade',
+    'Curricular_units_1st_sem_without_evaluations', 'Curricular_units_2nd_sem_credited',
+    'Curricular_units_2nd_sem_enrolled', 'Curricular_units_2nd_sem_evaluations',
+    'Curricular_units_2nd_sem_approved', 'Curricular_units_2nd_sem_grade',
+    'Curricular_units_2nd_sem_without_evaluations', 'Unemployment_rate',
+    'Inflation_rate', 'GDP'
+]
+
+# LabelEncoder codes for the raw Status column (alphabetical order)
+STATUS_CODES = {'Dropout': 0, 'Enrolled': 1, 'Graduate': 2}
+
+# Model output classes after dropping Enrolled and remapping Graduate to 1
+LABELS = {0: 'Dropout', 1: 'Graduate'}
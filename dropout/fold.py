@@ -0,0 +1,163 @@
+"""Fold the StandardScaler into the booster's split thresholds.
+
+Tree splits only compare one feature against a threshold, and scaling is a
+monotone per-feature affine map, so `(x - mean) / scale < t` can be rewritten
+as `x < t * scale + mean`. The folded booster takes raw features and skips
+scaler.transform entirely.
+
+    python -m dropout.fold            # writes model/model_xgb_folded.json
+    python -m dropout.fold --check    # equivalence check over encoded_data.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH, FEATURE_NAMES, FOLDED_MODEL_PATH, MODEL_PATH, PREPROCESSING_PATH
+from dropout.preprocessing import file_checksum, load_bundle
+
+SOURCE_ATTR = 'source_model_sha256'
+
+
+def _scaled32(x, mean, scale):
+    """Largest scaled value the original pipeline produces for a float32 bucket
+
+    Inputs are float64 decimals scaled before xgboost's float32 cast, so many
+    distinct raw values share one float32 x. Evaluating the top edge of x's
+    rounding interval sends the whole bucket right whenever any value in it
+    goes right; histogram cut points are themselves data values, so the value
+    sitting exactly on a cut lands on the correct side.
+    """
+    x = np.asarray(x, dtype=np.float32)
+    upper = np.nextafter(x, np.float32(np.inf)).astype(np.float64)
+    edge = np.nextafter((x.astype(np.float64) + upper) / 2, -np.inf)
+    return ((edge - mean) / scale).astype(np.float32)
+
+
+def raw_thresholds(thresholds, mean, scale):
+    """Map scaled-space thresholds to the smallest equivalent raw float32 value
+
+    The folded split `float32(x) < T` takes the same branch as the original
+    `float32((x - mean) / scale) < t` for every raw x except values within
+    half a float32 ulp below a cut point. Starting from t * scale + mean, T is
+    nudged a few ulps until that holds.
+    """
+    t = np.asarray(thresholds, dtype=np.float32)
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+    T = (t.astype(np.float64) * scale + mean).astype(np.float32)
+
+    # Move up while T itself would still go left
+    low = _scaled32(T, mean, scale) < t
+    while low.any():
+        T[low] = np.nextafter(T[low], np.float32(np.inf))
+        low = _scaled32(T, mean, scale) < t
+
+    # Move down while the value just below T would already go right
+    below = np.nextafter(T, np.float32(-np.inf))
+    high = _scaled32(below, mean, scale) >= t
+    while high.any():
+        T[high] = below[high]
+        below = np.nextafter(T, np.float32(-np.inf))
+        high = _scaled32(below, mean, scale) >= t
+    return T
+
+
+def fold_model_json(model_json, mean, scale):
+    """Rewrite split thresholds of an XGBClassifier JSON dump in place"""
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+    for tree in model_json['learner']['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'])
+        split = left != -1
+        features = np.asarray(tree['split_indices'])[split]
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        conditions[split] = raw_thresholds(conditions[split], mean[features], scale[features])
+        tree['split_conditions'] = [float(c) for c in conditions]
+    return model_json
+
+
+def fold_model(model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH, output=FOLDED_MODEL_PATH):
+    """Write a booster that scores raw, unscaled features"""
+    from dropout.scoring import load_model
+
+    bundle = load_bundle(preprocessing_path, model_path)
+    model = load_model(model_path)
+
+    # Save through the sklearn wrapper so XGBClassifier.load_model can read it back
+    fd, tmp = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        model.save_model(tmp)
+        with open(tmp) as f:
+            model_json = json.load(f)
+    finally:
+        os.remove(tmp)
+
+    fold_model_json(model_json, bundle['mean'], bundle['scale'])
+    model_json['learner'].setdefault('attributes', {})[SOURCE_ATTR] = file_checksum(model_path)
+    with open(output, 'w') as f:
+        json.dump(model_json, f)
+
+
+def load_folded(path=FOLDED_MODEL_PATH, model_path=MODEL_PATH, verify=True):
+    """Load the folded booster as an XGBClassifier, checking its source model"""
+    from xgboost import XGBClassifier
+
+    model = XGBClassifier()
+    model.load_model(path)
+    source = model.get_booster().attr(SOURCE_ATTR)
+    if verify and model_path is not None and source != file_checksum(model_path):
+        raise ValueError(
+            f"Folded model {path} was built from a different model than {model_path}; "
+            "rebuild it with `python -m dropout.fold`"
+        )
+    return model
+
+
+def check_equivalence(folded_path=FOLDED_MODEL_PATH, model_path=MODEL_PATH,
+                      preprocessing_path=PREPROCESSING_PATH, data_path=ENCODED_DATA_PATH):
+    """Compare the folded booster on raw features against scaler + model"""
+    import pandas as pd
+
+    from dropout.preprocessing import load_scaler
+    from dropout.scoring import load_model
+
+    X = pd.read_csv(data_path)[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    expected = load_model(model_path).predict_proba(load_scaler(preprocessing_path, model_path).transform(X))
+    actual = load_folded(folded_path, model_path).predict_proba(X)
+
+    diff = np.abs(expected - actual)
+    return {
+        'rows': len(X),
+        'max_abs_diff': float(diff.max()),
+        'rows_differing': int((diff.max(axis=1) > 0).sum()),
+        'label_mismatches': int(((expected[:, 1] > 0.5) != (actual[:, 1] > 0.5)).sum()),
+        'ok': bool(diff.max() <= 1e-6),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold the scaler into the model's split thresholds")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--output', default=FOLDED_MODEL_PATH)
+    parser.add_argument('--check', action='store_true', help="verify against scaler + model instead of folding")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="rows used for the equivalence check")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        report = check_equivalence(args.output, args.model, args.preprocessing, args.data)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report['ok'] else 1)
+
+    fold_model(args.model, args.preprocessing, args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""Incremental cohort ingestion with delta scoring.
+
+Each snapshot is keyed by a student ID column and diffed against the last
+ingested snapshot stored in SQLite. Only new and changed rows go through
+the model, so the cost of a run follows the size of the change rather than
+the size of the cohort. Every run is recorded, and scores are appended per
+run so a student's score history is kept:
+
+    python -m dropout.ingest term_2024_1.csv --id-column Student_ID
+    python -m dropout.ingest term_2024_2.csv --id-column Student_ID
+
+The store holds three tables: `runs` (one row per ingestion), `students`
+(current row hash per ID) and `scores` (one row per rescored student and
+run), plus a `latest_scores` view. Replacing the model or preprocessing
+bundle triggers a full rescore on the next run.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dropout.features import FEATURE_NAMES, MODEL_PATH, PREPROCESSING_PATH, ROOT
+from dropout.preprocessing import file_checksum
+from dropout.scoring import BACKENDS, feature_matrix, load_pipeline, predict_batch, read_table
+
+DEFAULT_DB_PATH = ROOT / 'data' / 'cohort.sqlite'
+DEFAULT_ID_COLUMN = 'Student_ID'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    source_sha256 TEXT NOT NULL,
+    model_key TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    new INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    unchanged INTEGER NOT NULL,
+    removed INTEGER NOT NULL,
+    rescored INTEGER NOT NULL,
+    elapsed_s REAL
+);
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    row_hash INTEGER NOT NULL,
+    first_run INTEGER NOT NULL,
+    last_changed_run INTEGER NOT NULL,
+    removed_run INTEGER
+);
+CREATE TABLE IF NOT EXISTS scores (
+    student_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    dropout_probability REAL NOT NULL,
+    graduate_probability REAL NOT NULL,
+    prediction INTEGER NOT NULL,
+    PRIMARY KEY (student_id, run_id)
+);
+CREATE VIEW IF NOT EXISTS latest_scores AS
+    SELECT scores.*
+    FROM scores
+    JOIN (SELECT student_id, MAX(run_id) AS run_id FROM scores GROUP BY student_id) latest
+        USING (student_id, run_id);
+"""
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    db = sqlite3.connect(db_path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def model_key(model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH, backend='joblib'):
+    """Identity of the scoring pipeline, a change forces a full rescore"""
+    parts = [backend, file_checksum(model_path)]
+    if Path(preprocessing_path).exists():
+        parts.append(file_checksum(preprocessing_path))
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def row_hashes(df):
+    """64-bit hash of each row's features, insensitive to int/float spelling"""
+    import pandas as pd
+
+    features = df[FEATURE_NAMES].astype(np.float64)
+    return pd.util.hash_pandas_object(features, index=False).to_numpy().view(np.int64)
+
+
+def read_snapshot(path, id_column=DEFAULT_ID_COLUMN, sep=None):
+    """Load a snapshot indexed by student ID (row position when id_column is None)"""
+    from dropout.streaming import sniff_delimiter
+
+    if sep is None and Path(path).suffix.lower() == '.csv':
+        sep = sniff_delimiter(path)
+    df = read_table(path, sep=sep or ',')
+
+    if id_column is None:
+        df.index = df.index.astype(str)
+    elif id_column not in df.columns:
+        raise ValueError(f"ID column {id_column!r} not found in {path}, pass --id-column or --row-index")
+    else:
+        df.index = df.pop(id_column).astype(str)
+    if not df.index.is_unique:
+        duplicated = df.index[df.index.duplicated()].unique()[:5].tolist()
+        raise ValueError(f"Duplicate student IDs in {path}: {duplicated}")
+    df.index.name = 'student_id'
+    return df
+
+
+def diff_snapshot(db, df, hashes):
+    """Split the snapshot IDs into new, changed and unchanged, plus removed IDs"""
+    import pandas as pd
+
+    previous = pd.read_sql_query(
+        "SELECT student_id, row_hash FROM students WHERE removed_run IS NULL", db, index_col='student_id',
+    )['row_hash']
+    current = pd.Series(hashes, index=df.index)
+
+    known = current.index.isin(previous.index)
+    same = known & (current.to_numpy() == previous.reindex(current.index).to_numpy())
+    return {
+        'new': current.index[~known],
+        'changed': current.index[known & ~same],
+        'unchanged': current.index[same],
+        'removed': previous.index[~previous.index.isin(current.index)],
+    }
+
+
+def ingest(path, db_path=DEFAULT_DB_PATH, id_column=DEFAULT_ID_COLUMN, sep=None, backend='joblib',
+           model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH, rescore_all=False):
+    """Ingest one snapshot and rescore only the rows that differ from the last one"""
+    start = time.perf_counter()
+    df = read_snapshot(path, id_column, sep)
+    hashes = row_hashes(df)
+    key = model_key(model_path, preprocessing_path, backend)
+
+    with connect(db_path) as db:
+        last = db.execute("SELECT model_key FROM runs ORDER BY run_id DESC LIMIT 1").fetchone()
+        rescore_all = rescore_all or (last is not None and last[0] != key)
+        delta = diff_snapshot(db, df, hashes)
+
+        cursor = db.execute(
+            "INSERT INTO runs (source, source_sha256, model_key, backend, started_at, rows, new, changed, "
+            "unchanged, removed, rescored) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (str(path), file_checksum(path) if Path(path).is_file() else '', key, backend,
+             time.strftime('%Y-%m-%dT%H:%M:%S%z'), len(df), len(delta['new']), len(delta['changed']),
+             len(delta['unchanged']), len(delta['removed'])),
+        )
+        run_id = cursor.lastrowid
+
+        rescore = df.index if rescore_all else delta['new'].append(delta['changed'])
+        if len(rescore):
+            model, scaler = load_pipeline(backend, model_path, preprocessing_path)
+            predictions, probabilities = predict_batch(feature_matrix(df.loc[rescore]), model, scaler)
+            db.executemany(
+                "INSERT INTO scores VALUES (?, ?, ?, ?, ?)",
+                zip(rescore, [run_id] * len(rescore), probabilities[:, 0].tolist(),
+                    probabilities[:, 1].tolist(), predictions.tolist()),
+            )
+
+        row_hash = dict(zip(df.index, hashes.tolist()))
+        db.executemany(
+            "INSERT INTO students (student_id, row_hash, first_run, last_changed_run) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (student_id) DO UPDATE SET row_hash = excluded.row_hash, "
+            "last_changed_run = excluded.last_changed_run, removed_run = NULL",
+            ((sid, row_hash[sid], run_id, run_id) for sid in delta['new'].append(delta['changed'])),
+        )
+        db.executemany(
+            "UPDATE students SET removed_run = ? WHERE student_id = ?",
+            ((run_id, sid) for sid in delta['removed']),
+        )
+
+        elapsed = time.perf_counter() - start
+        db.execute("UPDATE runs SET rescored = ?, elapsed_s = ? WHERE run_id = ?", (len(rescore), elapsed, run_id))
+
+    db.close()
+    return {
+        'run_id': run_id,
+        'rows': len(df),
+        **{name: len(ids) for name, ids in delta.items()},
+        'rescored': len(rescore),
+        'full_rescore': rescore_all,
+        'elapsed_s': elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a cohort snapshot and rescore only changed students")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with an ID column and the 36 features")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite store to update")
+    parser.add_argument('--id-column', default=DEFAULT_ID_COLUMN, help="column holding the student ID")
+    parser.add_argument('--row-index', action='store_true', help="key students by row position instead of an ID column")
+    parser.add_argument('--sep', default=None, help="CSV delimiter, detected from the header by default")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    parser.add_argument('--rescore-all', action='store_true', help="rescore every student, not only the delta")
+    args = parser.parse_args(argv)
+
+    summary = ingest(
+        args.input, args.db, None if args.row_index else args.id_column, args.sep, args.backend,
+        args.model, args.preprocessing, args.rescore_all,
+    )
+    print(f"Run {summary['run_id']}: {summary['rows']:,} rows, {summary['new']:,} new, "
+          f"{summary['changed']:,} changed, {summary['unchanged']:,} unchanged, {summary['removed']:,} removed")
+    print(f"Rescored {summary['rescored']:,} rows{' (full rescore)' if summary['full_rescore'] else ''} "
+          f"in {summary['elapsed_s']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Global model insights computed once, at training time.
+
+Evaluates the model on the notebook's held-out test split and stores
+everything the app's Model Insights tab draws in model/insights.json:
+
+- feature importances (booster gain and mean |TreeSHAP| contribution);
+- the test-set confusion matrix and the notebook's metrics;
+- a reliability (calibration) curve and Brier score;
+- ROC and precision-recall curves, with Dropout as the positive class.
+
+The app only reads this file. It is rebuilt by dropout.pipeline after every
+training run, or by hand:
+
+    python -m dropout.insights
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH, FEATURE_NAMES, INSIGHTS_PATH, LABELS, MODEL_PATH, PREPROCESSING_PATH
+from dropout.preprocessing import file_checksum
+
+INSIGHTS_VERSION = 1
+
+# Curves are thinned to about this many points to keep the file small
+CURVE_POINTS = 200
+
+
+def thin(*columns, points=CURVE_POINTS):
+    """Evenly subsample curve columns, always keeping both ends"""
+    n = len(columns[0])
+    keep = np.unique(np.linspace(0, n - 1, min(n, points)).round().astype(int))
+    return [np.asarray(column)[keep].round(6).tolist() for column in columns]
+
+
+def importances(model, contributions):
+    booster = model.get_booster()
+    # Boosters trained on plain arrays name their features f0..f35
+    gain = booster.get_score(importance_type='gain')
+    names = booster.feature_names or [f'f{i}' for i in range(len(FEATURE_NAMES))]
+    return {
+        'feature': FEATURE_NAMES,
+        'gain': [round(float(gain.get(name, 0.0)), 6) for name in names],
+        'mean_abs_shap': np.abs(contributions).mean(axis=0).round(6).tolist(),
+    }
+
+
+def build_insights(model, scaler, X_test, y_test, model_sha256, data_sha256):
+    """Evaluate a fitted model on the test split"""
+    from sklearn.calibration import calibration_curve
+    from sklearn.metrics import (
+        accuracy_score, auc, average_precision_score, brier_score_loss, confusion_matrix,
+        f1_score, precision_recall_curve, precision_score, recall_score, roc_curve,
+    )
+
+    from dropout.explain import dropout_contributions
+    from dropout.scoring import predict_batch
+
+    X_test = np.asarray(X_test, dtype=np.float64)
+    y_test = np.asarray(y_test, dtype=np.int64)
+
+    y_pred, probabilities = predict_batch(X_test, model, scaler)
+    contributions, _ = dropout_contributions(X_test, model, scaler)
+
+    # Dropout (class 0) is the outcome advisors act on, so curves treat it as positive
+    is_dropout = (y_test == 0).astype(int)
+    p_dropout = probabilities[:, 0]
+    fpr, tpr, _ = roc_curve(is_dropout, p_dropout)
+    precision, recall, _ = precision_recall_curve(is_dropout, p_dropout)
+    observed, predicted = calibration_curve(is_dropout, p_dropout, n_bins=10, strategy='quantile')
+
+    return {
+        'version': INSIGHTS_VERSION,
+        'model_sha256': model_sha256,
+        'data_sha256': data_sha256,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'test_rows': len(y_test),
+        'labels': [LABELS[0], LABELS[1]],
+        'metrics': {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'precision': precision_score(y_test, y_pred),
+            'recall': recall_score(y_test, y_pred),
+            'f1': f1_score(y_test, y_pred),
+            'roc_auc': auc(fpr, tpr),
+            'average_precision': average_precision_score(is_dropout, p_dropout),
+            'brier': brier_score_loss(is_dropout, p_dropout),
+        },
+        'confusion_matrix': confusion_matrix(y_test, y_pred, labels=[0, 1]).tolist(),
+        'importances': importances(model, contributions),
+        'reliability': dict(zip(('predicted', 'observed'), thin(predicted, observed))),
+        'roc': dict(zip(('fpr', 'tpr'), thin(fpr, tpr))),
+        # precision_recall_curve runs from high recall to low, reverse for plotting
+        'pr': dict(zip(('recall', 'precision'), thin(recall[::-1], precision[::-1]))),
+    }
+
+
+def insights_from_files(data_path=ENCODED_DATA_PATH, model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH):
+    from dropout.preprocessing import load_training_frame, split_training_data
+    from dropout.scoring import load_pipeline
+
+    model, scaler = load_pipeline('joblib', model_path, preprocessing_path)
+    df, data_sha256 = load_training_frame(data_path)
+    _, X_test, _, y_test = split_training_data(df)
+    return build_insights(model, scaler, X_test, y_test, file_checksum(model_path), data_sha256)
+
+
+def save_insights(insights, path=INSIGHTS_PATH):
+    with open(path, 'w') as f:
+        json.dump(insights, f, indent=1)
+
+
+def load_insights(path=INSIGHTS_PATH):
+    with open(path) as f:
+        insights = json.load(f)
+    if insights.get('version') != INSIGHTS_VERSION:
+        raise ValueError(f"Unsupported insights version {insights.get('version')!r}, expected {INSIGHTS_VERSION}")
+    return insights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the model once and write the app's insight artifacts")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="encoded CSV or columnar directory")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('-o', '--output', default=INSIGHTS_PATH)
+    args = parser.parse_args(argv)
+
+    insights = insights_from_files(args.data, args.model, args.preprocessing)
+    save_insights(insights, args.output)
+    metrics = insights['metrics']
+    print(f"Wrote {args.output}: F1 {metrics['f1']:.4f}, ROC AUC {metrics['roc_auc']:.4f}, "
+          f"Brier {metrics['brier']:.4f} on {insights['test_rows']} test rows")
+
+
+if __name__ == '__main__':
+    main()
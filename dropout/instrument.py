@@ -0,0 +1,183 @@
+"""Opt-in timing spans and counters for the Streamlit app.
+
+Set DROPOUT_INSTRUMENT=1 to enable. Otherwise `traced` returns the function
+untouched and `span`/`rerun` are no-ops. When enabled:
+
+- aggregate histograms and counters are rewritten after every rerun to
+  DROPOUT_METRICS_FILE (default instrument.prom) in Prometheus text format,
+  ready for node_exporter's textfile collector;
+- if DROPOUT_TRACE_FILE is set, every span is appended to it as one
+  OpenTelemetry-style JSON object per line.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+
+ENABLED = os.environ.get('DROPOUT_INSTRUMENT', '').lower() in ('1', 'true', 'yes')
+METRICS_FILE = os.environ.get('DROPOUT_METRICS_FILE', 'instrument.prom')
+TRACE_FILE = os.environ.get('DROPOUT_TRACE_FILE')
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Recorder:
+    """Per-rerun span lists plus process-wide histograms and counters"""
+
+    def __init__(self, metrics_file=METRICS_FILE, trace_file=TRACE_FILE):
+        self.metrics_file = metrics_file
+        self.trace_file = trace_file
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.histograms = {}
+        self.counters = {}
+
+    @property
+    def spans(self):
+        """Spans recorded so far in the current thread's rerun"""
+        return getattr(self._local, 'spans', [])
+
+    def increment(self, event, amount=1):
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + amount
+
+    def _observe(self, name, seconds):
+        with self._lock:
+            hist = self.histograms.setdefault(name, {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += seconds
+            hist['count'] += 1
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        local = self._local
+        # A span outside any rerun starts a trace of its own, closed again when it exits
+        outermost = getattr(local, 'stack', None) is None
+        if outermost:
+            local.stack, local.spans, local.trace_id = [], [], secrets.token_hex(16)
+        span_id = secrets.token_hex(8)
+        record = {
+            'name': name,
+            'trace_id': local.trace_id,
+            'span_id': span_id,
+            'parent_span_id': local.stack[-1] if local.stack else None,
+            'start_time_unix_nano': time.time_ns(),
+            'attributes': attributes,
+        }
+        local.stack.append(span_id)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            duration = time.perf_counter() - start
+            local.stack.pop()
+            if outermost:
+                local.stack = None
+            record['end_time_unix_nano'] = record['start_time_unix_nano'] + int(duration * 1e9)
+            record['duration_ms'] = duration * 1000
+            local.spans.append(record)
+            self._observe(name, duration)
+
+    def in_rerun(self):
+        """Whether the current thread is inside an open rerun scope"""
+        return getattr(self._local, 'rerun', False)
+
+    @contextlib.contextmanager
+    def rerun(self, name='rerun'):
+        """Group everything inside one Streamlit script run into a trace
+
+        A fragment runs either inside a full rerun, where its scope is just a
+        child span, or on its own, where it starts and flushes its own trace.
+        """
+        if self.in_rerun():
+            with self.span(name):
+                yield
+            return
+        local = self._local
+        local.stack, local.spans, local.trace_id = [], [], secrets.token_hex(16)
+        local.rerun = True
+        try:
+            with self.span(name):
+                yield
+        finally:
+            spans = local.spans
+            local.stack, local.rerun = None, False
+            self.flush(spans)
+            local.spans = spans
+
+    def flush(self, spans=()):
+        if self.trace_file and spans:
+            with self._lock, open(self.trace_file, 'a') as f:
+                for record in spans:
+                    f.write(json.dumps(record) + '\n')
+        if self.metrics_file:
+            tmp = f'{self.metrics_file}.tmp'
+            with open(tmp, 'w') as f:
+                f.write(self.prometheus())
+            os.replace(tmp, self.metrics_file)
+
+    def prometheus(self):
+        with self._lock:
+            lines = [
+                '# HELP dropout_span_seconds Time spent in instrumented app code paths.',
+                '# TYPE dropout_span_seconds histogram',
+            ]
+            for name, hist in sorted(self.histograms.items()):
+                for bound, count in zip(BUCKETS, hist['buckets']):
+                    lines.append(f'dropout_span_seconds_bucket{{span="{name}",le="{bound}"}} {count}')
+                lines.append(f'dropout_span_seconds_bucket{{span="{name}",le="+Inf"}} {hist["count"]}')
+                lines.append(f'dropout_span_seconds_sum{{span="{name}"}} {hist["sum"]:.9f}')
+                lines.append(f'dropout_span_seconds_count{{span="{name}"}} {hist["count"]}')
+            lines += [
+                '# HELP dropout_events_total Counted app events.',
+                '# TYPE dropout_events_total counter',
+            ]
+            for event, count in sorted(self.counters.items()):
+                lines.append(f'dropout_events_total{{event="{event}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+recorder = Recorder()
+
+
+def traced(name):
+    """Decorator recording a span per call; returns fn unchanged when disabled"""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with recorder.span(name):
+                return fn(*args, **kwargs)
+
+        # Keep Streamlit cache helpers such as .clear() reachable
+        for attr in ('clear',):
+            if hasattr(fn, attr):
+                setattr(wrapper, attr, getattr(fn, attr))
+        return wrapper
+    return decorate
+
+
+def span(name, **attributes):
+    return recorder.span(name, **attributes) if ENABLED else contextlib.nullcontext()
+
+
+def rerun(name='rerun'):
+    return recorder.rerun(name) if ENABLED else contextlib.nullcontext()
+
+
+def in_rerun():
+    return ENABLED and recorder.in_rerun()
+
+
+def increment(event, amount=1):
+    if ENABLED:
+        recorder.increment(event, amount)
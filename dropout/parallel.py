@@ -0,0 +1,173 @@
+"""Process-pool parallel scoring for bulk jobs.
+
+The feature matrix is copied once into a shared memory block, or, when it
+is already a memory-mapped columnar dataset (dropout.columnar), each worker
+maps the same .npy file and shares its pages. Each worker loads the model
+and preprocessing bundle once and writes probabilities straight into a
+shared output block, so no shard is pickled between processes and results
+come back in input order.
+
+    python -m dropout.parallel students.csv -o scored.csv --workers 32
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from dropout.columnar import is_columnar, load as load_columnar
+from dropout.features import MODEL_PATH, PREPROCESSING_PATH
+from dropout.scoring import BACKENDS, THRESHOLD, feature_matrix, load_pipeline, read_table, with_scores
+
+DEFAULT_SHARD_SIZE = 20_000
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(backend, model_path, preprocessing_path, input_ref, output_name, shape):
+    model, scaler = load_pipeline(backend, model_path, preprocessing_path)
+    # One booster thread per process, the pool provides the parallelism
+    if hasattr(model, 'set_params'):
+        model.set_params(n_jobs=1)
+
+    kind, name = input_ref
+    if kind == 'npy':
+        input_shm, X = None, np.load(name, mmap_mode='r')
+    else:
+        input_shm = shared_memory.SharedMemory(name=name)
+        X = np.ndarray(shape, dtype=np.float64, buffer=input_shm.buf)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    _worker.update(
+        model=model,
+        scaler=scaler,
+        input_shm=input_shm,
+        output_shm=output_shm,
+        X=X,
+        out=np.ndarray((shape[0], 2), dtype=np.float64, buffer=output_shm.buf),
+    )
+
+
+def _score_shard(start, stop):
+    X = _worker['X'][start:stop]
+    _worker['out'][start:stop] = _worker['model'].predict_proba(_worker['scaler'].transform(X))
+    return stop - start
+
+
+def maps_whole_npy(X):
+    """Whether X is a float64 memmap of an entire .npy file
+
+    Only then can workers reopen it by file name; a slice, or a raw
+    memmap without a .npy header, would be read from the wrong offset.
+    """
+    if not (isinstance(X, np.memmap) and X.filename is not None
+            and X.dtype == np.float64 and X.flags.c_contiguous):
+        return False
+    try:
+        with open(X.filename, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            data_offset = f.tell()
+    except (OSError, ValueError):
+        return False
+    return shape == X.shape and not fortran_order and dtype == X.dtype and X.offset == data_offset
+
+
+def score_parallel(X, workers=None, shard_size=DEFAULT_SHARD_SIZE, backend='joblib',
+                   model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH):
+    """Score a feature matrix across a process pool
+
+    Returns predictions and the (n, 2) probability matrix in input order.
+    """
+    # Workers can map a whole float64 .npy file themselves instead of a shared copy
+    mapped = maps_whole_npy(X)
+    if not mapped:
+        X = np.ascontiguousarray(X, dtype=np.float64)
+    n = len(X)
+    workers = workers or os.cpu_count() or 1
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2), dtype=np.float64)
+
+    input_shm = None if mapped else shared_memory.SharedMemory(create=True, size=X.nbytes)
+    output_shm = shared_memory.SharedMemory(create=True, size=n * 2 * 8)
+    input_ref = ('npy', X.filename) if mapped else ('shm', input_shm.name)
+    try:
+        if input_shm is not None:
+            np.ndarray(X.shape, dtype=np.float64, buffer=input_shm.buf)[:] = X
+        shards = [(start, min(start + shard_size, n)) for start in range(0, n, shard_size)]
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            mp_context=get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(backend, model_path, preprocessing_path, input_ref, output_shm.name, X.shape),
+        ) as pool:
+            list(pool.map(_score_shard, *zip(*shards)))
+
+        probabilities = np.ndarray((n, 2), dtype=np.float64, buffer=output_shm.buf).copy()
+    finally:
+        for shm in (input_shm, output_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    prediction = (probabilities[:, 1] > THRESHOLD).astype(np.int64)
+    return prediction, probabilities
+
+
+def write_scored(df, predictions, probabilities, path, block_size=DEFAULT_SHARD_SIZE):
+    """Write df with its score columns appended, one block of rows at a time
+
+    Only the block being written is copied, so a frame viewing a
+    memory-mapped columnar dataset is never materialized whole.
+    """
+    from dropout.streaming import ChunkWriter
+
+    writer = ChunkWriter(path)
+    try:
+        # At least one block, so an empty input still gets its header
+        for start in range(0, max(len(df), 1), block_size):
+            stop = start + block_size
+            writer.write(with_scores(df.iloc[start:stop], predictions[start:stop], probabilities[start:stop]))
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a cohort file across a process pool")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with the 36 feature columns")
+    parser.add_argument('-o', '--output', required=True, help="CSV or Parquet file to write")
+    parser.add_argument('--sep', default=',', help="CSV delimiter (use ';' for data/data.csv)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    args = parser.parse_args(argv)
+
+    if is_columnar(args.input):
+        dataset = load_columnar(args.input)
+        df, X = dataset.to_frame(), dataset.X
+    else:
+        df = read_table(args.input, sep=args.sep)
+        X = feature_matrix(df)
+    start = time.perf_counter()
+    predictions, probabilities = score_parallel(
+        X, workers=args.workers, shard_size=args.shard_size, backend=args.backend,
+        model_path=args.model, preprocessing_path=args.preprocessing,
+    )
+    elapsed = time.perf_counter() - start
+    write_scored(df, predictions, probabilities, args.output, args.shard_size)
+
+    print(f"Scored {len(df):,} rows with {args.workers} workers in {elapsed:.2f}s "
+          f"({len(df) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""Reproducible training pipeline with content-hashed, cached stages.
+
+The notebook's preparation steps run as a chain of stages:
+
+    encode -> split -> resample -> scale -> fit
+
+Each stage's cache key hashes its name, version and parameters together
+with the keys of the stages it consumes, and the chain starts from the
+SHA-256 of the source CSV, by default the encoded CSV dropout.train and
+dropout.preprocessing read so the recorded hashes agree. Outputs are stored
+under .cache/pipeline/, so rerunning with different XGBoost parameters
+reuses everything up to `fit`, and rerunning with the same parameters
+reuses the fitted model too. The resample stage runs one of the
+dropout.resample strategies (exact SMOTE by default, as in the notebook).
+
+Besides model/model_xgb.joblib and model/preprocessing.json the run writes
+model/model_xgb.manifest.json recording the source data, stage keys,
+parameters, library versions and test metrics behind the model, the app's
+Model Insights artifacts (dropout.insights), and, when the default model is
+written, the folded and compiled backends (dropout.fold, dropout.export):
+
+    python -m dropout.pipeline
+    python -m dropout.pipeline --params '{"max_depth": 4, "n_estimators": 300}'
+    python -m dropout.pipeline --from-study
+    python -m dropout.pipeline --resample class-weight
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from dropout.features import (
+    COMPILED_MODEL_PATH, ENCODED_DATA_PATH, FEATURE_NAMES, FOLDED_MODEL_PATH, INSIGHTS_PATH, MANIFEST_PATH, MODEL_PATH,
+    PREPROCESSING_PATH, ROOT,
+)
+from dropout.preprocessing import file_checksum
+from dropout.resample import STRATEGIES
+
+CACHE_DIR = ROOT / '.cache' / 'pipeline'
+SEED = 42
+
+# Bump a stage's version when its code changes so stale outputs are not reused
+STAGE_VERSIONS = {'encode': 1, 'split': 1, 'resample': 1, 'scale': 1, 'fit': 2}
+
+
+def stage_key(name, params, inputs):
+    payload = json.dumps(
+        {'stage': name, 'version': STAGE_VERSIONS[name], 'params': params, 'inputs': inputs},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class StageCache:
+    """Runs stages, storing each output as cache_dir/<stage>-<key>.joblib"""
+
+    def __init__(self, cache_dir=CACHE_DIR, enabled=True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.log = []
+
+    def run(self, name, params, inputs, fn):
+        """Return (key, output), computing the output only on a cache miss"""
+        import joblib
+
+        key = stage_key(name, params, inputs)
+        path = self.cache_dir / f'{name}-{key}.joblib'
+        start = time.perf_counter()
+        if self.enabled and path.exists():
+            output, status = joblib.load(path), 'cached'
+        else:
+            output, status = fn(), 'computed'
+            if self.enabled:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix('.tmp')
+                joblib.dump(output, tmp)
+                os.replace(tmp, path)
+        self.log.append((name, key, status, time.perf_counter() - start))
+        return key, output
+
+
+def data_checksum(data_path):
+    """Content hash of the source, a columnar copy reports its source CSV's"""
+    from dropout.columnar import is_columnar, load
+
+    if is_columnar(data_path):
+        return load(data_path).meta['source_sha256']
+    return file_checksum(data_path)
+
+
+def encode(data_path):
+    """Read the raw (';') or encoded (',') CSV and label-encode Status"""
+    import pandas as pd
+
+    from dropout.columnar import is_columnar
+    from dropout.preprocessing import load_training_frame
+    from dropout.streaming import encode_chunk, sniff_delimiter
+
+    if is_columnar(data_path):
+        return load_training_frame(data_path)[0]
+    return encode_chunk(pd.read_csv(data_path, sep=sniff_delimiter(data_path), encoding='utf-8-sig'))
+
+
+def fit(resampled, scaler, params):
+    from xgboost import XGBClassifier
+
+    X_train, y_train, fit_params = resampled
+    model = XGBClassifier(**{**fit_params, **params}, random_state=SEED, eval_metric='logloss')
+    model.fit(scaler.transform(X_train), y_train)
+    return model
+
+
+def evaluate(model, scaler, split):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    _, X_test, _, y_test = split
+    y_pred = model.predict(scaler.transform(X_test))
+    return {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+    }
+
+
+def library_versions():
+    from importlib.metadata import version
+
+    return {name: version(name) for name in ('xgboost', 'scikit-learn', 'imbalanced-learn', 'pandas', 'numpy')}
+
+
+def run(params=None, data_path=ENCODED_DATA_PATH, model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH,
+        manifest_path=MANIFEST_PATH, cache=None, strategy='smote', insights_path=INSIGHTS_PATH,
+        folded_path=None, compiled_path=None):
+    """Run the pipeline, write the model, bundle and manifest, return the manifest
+
+    folded_path and compiled_path, when given, are rebuilt from the new model
+    so the other scoring backends do not keep serving the previous one.
+    """
+    import joblib
+
+    from dropout.preprocessing import fit_scaler, make_bundle, save_bundle, split_training_data
+    from dropout.resample import resample
+
+    params = dict(params or {})
+    cache = cache or StageCache()
+    data_sha256 = data_checksum(data_path)
+
+    encoded_key, df = cache.run('encode', {}, [data_sha256], lambda: encode(data_path))
+    split_key, split = cache.run(
+        'split', {'test_size': 0.2, 'random_state': SEED}, [encoded_key], lambda: split_training_data(df),
+    )
+    resample_key, resampled = cache.run(
+        'resample', {'strategy': strategy, 'random_state': SEED}, [split_key],
+        lambda: resample(split[0], split[2], strategy, SEED),
+    )
+    scale_key, scaler = cache.run('scale', {}, [resample_key], lambda: fit_scaler(resampled[0]))
+    fit_key, model = cache.run('fit', params, [resample_key, scale_key], lambda: fit(resampled, scaler, params))
+
+    joblib.dump(model, model_path)
+    save_bundle(make_bundle(scaler, model_path, data_sha256), preprocessing_path)
+
+    manifest = {
+        'model': str(model_path),
+        'model_sha256': file_checksum(model_path),
+        'preprocessing_sha256': file_checksum(preprocessing_path),
+        'data': str(data_path),
+        'data_sha256': data_sha256,
+        'params': params,
+        'resample': {'strategy': strategy, 'fit_params': resampled[2]},
+        'seed': SEED,
+        'stages': {name: key for name, key, _, _ in cache.log},
+        'feature_names': FEATURE_NAMES,
+        'libraries': library_versions(),
+        'test_metrics': evaluate(model, scaler, split),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    if insights_path is not None:
+        from dropout.insights import build_insights, save_insights
+
+        _, X_test, _, y_test = split
+        save_insights(
+            build_insights(model, scaler, X_test, y_test, manifest['model_sha256'], data_sha256), insights_path,
+        )
+    if folded_path is not None:
+        from dropout.fold import fold_model
+
+        fold_model(model_path, preprocessing_path, folded_path)
+    if compiled_path is not None:
+        from dropout.export import export_model
+
+        export_model(model_path, preprocessing_path, compiled_path)
+    return manifest
+
+
+def parse_params(value):
+    """JSON object given inline or as a path to a JSON file"""
+    if value is None:
+        return {}
+    if Path(value).is_file():
+        with open(value) as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the cached training pipeline and record the model's inputs")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="raw (';') or encoded (',') CSV, or a columnar directory")
+    parser.add_argument('--params', default=None, help="XGBoost parameters as JSON or a JSON file (default: library defaults)")
+    parser.add_argument('--resample', choices=STRATEGIES, default='smote', help="class-imbalance strategy")
+    parser.add_argument('--from-study', action='store_true', help="use the best parameters of the dropout.train study")
+    parser.add_argument('--storage', default=None, help="Optuna storage URL for --from-study")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--manifest', default=MANIFEST_PATH)
+    parser.add_argument('--insights', default=INSIGHTS_PATH)
+    parser.add_argument('--folded', default=None, help=f"folded backend to rebuild (default: {FOLDED_MODEL_PATH.name} "
+                        "when writing the default model)")
+    parser.add_argument('--compiled', default=None, help=f"compiled backend to rebuild (default: {COMPILED_MODEL_PATH.name} "
+                        "when writing the default model)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help="recompute every stage")
+    args = parser.parse_args(argv)
+
+    params = parse_params(args.params)
+    if args.from_study:
+        from dropout.train import DEFAULT_STORAGE, best_params, load_study
+
+        params = {**best_params(load_study(args.storage or DEFAULT_STORAGE)), **params}
+
+    default_model = str(args.model) == str(MODEL_PATH)
+    folded = args.folded or (FOLDED_MODEL_PATH if default_model else None)
+    compiled = args.compiled or (COMPILED_MODEL_PATH if default_model else None)
+
+    cache = StageCache(args.cache_dir, enabled=not args.no_cache)
+    manifest = run(params, args.data, args.model, args.preprocessing, args.manifest, cache, args.resample, args.insights,
+                   folded, compiled)
+    for name, key, status, elapsed in cache.log:
+        print(f"{name:8s} {key}  {status:8s} {elapsed:6.2f}s")
+    print("Test set: " + ', '.join(f"{name} {value:.4f}" for name, value in manifest['test_metrics'].items()))
+    print(f"Wrote {args.model} (sha256 {manifest['model_sha256'][:12]}), {args.preprocessing} and {args.manifest}")
+    if folded or compiled:
+        print("Rebuilt " + " and ".join(str(path) for path in (folded, compiled) if path))
+    else:
+        print("Refresh the other backends with `python -m dropout.fold` and `python -m dropout.export`")
+
+
+if __name__ == '__main__':
+    main()
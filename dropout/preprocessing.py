@@ -0,0 +1,158 @@
+"""Versioned preprocessing bundle stored next to the trained model.
+
+The bundle holds the StandardScaler statistics fitted on the SMOTE-resampled
+training split (as in model/notebook.ipynb), the feature order and the label
+mapping, plus the SHA-256 of the model file it belongs to.
+
+Build it with:
+
+    python -m dropout.preprocessing
+"""
+
+import argparse
+import hashlib
+import json
+
+import numpy as np
+
+from dropout.features import (
+    ENCODED_DATA_PATH, FEATURE_NAMES, LABELS, MODEL_PATH, PREPROCESSING_PATH, TARGET
+)
+
+BUNDLE_VERSION = 1
+
+
+def file_checksum(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Scaler:
+    """Minimal StandardScaler replacement driven by stored statistics"""
+
+    def __init__(self, mean, scale, feature_names):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.feature_names_in_ = list(feature_names)
+
+    def transform(self, X):
+        # Reorder DataFrame columns to the training layout
+        if hasattr(X, 'columns'):
+            X = X[self.feature_names_in_]
+        X = np.asarray(X, dtype=np.float64)
+        return (X - self.mean_) / self.scale_
+
+
+class Passthrough:
+    """Scaler stand-in for models that take raw, unscaled features"""
+
+    feature_names_in_ = FEATURE_NAMES
+
+    def transform(self, X):
+        if hasattr(X, 'columns'):
+            X = X[FEATURE_NAMES]
+        return np.asarray(X, dtype=np.float64)
+
+
+def split_training_data(df, test_size=0.2, random_state=42):
+    """Reproduce the notebook's Enrolled filter and train/test split"""
+    from sklearn.model_selection import train_test_split
+
+    df = df[df[TARGET] != 1].reset_index(drop=True)
+    df.loc[:, TARGET] = df[TARGET].replace({2: 1})
+    X = df[FEATURE_NAMES]
+    y = df[TARGET]
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def fit_scaler(X):
+    """Fit scaler statistics the same way StandardScaler does"""
+    X = np.asarray(X, dtype=np.float64)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0.0] = 1.0
+    return Scaler(mean, scale, FEATURE_NAMES)
+
+
+def load_training_frame(data_path=ENCODED_DATA_PATH):
+    """Read the encoded training data (CSV or columnar) and its checksum"""
+    import pandas as pd
+
+    from dropout.columnar import is_columnar, load
+
+    if is_columnar(data_path):
+        dataset = load(data_path)
+        return dataset.to_frame(source_dtypes=True), dataset.meta['source_sha256']
+    return pd.read_csv(data_path), file_checksum(data_path)
+
+
+def build_bundle(data_path=ENCODED_DATA_PATH, model_path=MODEL_PATH):
+    """Fit the scaler on the SMOTE-resampled training split and describe it"""
+    from imblearn.over_sampling import SMOTE
+
+    df, data_sha256 = load_training_frame(data_path)
+    X_train, _, y_train, _ = split_training_data(df)
+    X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+    return make_bundle(fit_scaler(X_train), model_path, data_sha256)
+
+
+def make_bundle(scaler, model_path, data_sha256):
+    return {
+        'version': BUNDLE_VERSION,
+        'feature_names': scaler.feature_names_in_,
+        'mean': scaler.mean_.tolist(),
+        'scale': scaler.scale_.tolist(),
+        'labels': {str(k): v for k, v in LABELS.items()},
+        'model_sha256': file_checksum(model_path),
+        'data_sha256': data_sha256,
+    }
+
+
+def save_bundle(bundle, path=PREPROCESSING_PATH):
+    with open(path, 'w') as f:
+        json.dump(bundle, f, indent=2)
+
+
+def load_bundle(path=PREPROCESSING_PATH, model_path=MODEL_PATH, verify=True):
+    """Load a bundle, checking that it was built for the given model file"""
+    with open(path) as f:
+        bundle = json.load(f)
+
+    if bundle.get('version') != BUNDLE_VERSION:
+        raise ValueError(
+            f"Unsupported preprocessing bundle version {bundle.get('version')!r}, "
+            f"expected {BUNDLE_VERSION}"
+        )
+    if bundle['feature_names'] != FEATURE_NAMES:
+        raise ValueError("Preprocessing bundle feature order does not match FEATURE_NAMES")
+    if verify and model_path is not None and bundle['model_sha256'] != file_checksum(model_path):
+        raise ValueError(
+            f"Preprocessing bundle {path} was built for a different model than {model_path}; "
+            "rebuild it with `python -m dropout.preprocessing`"
+        )
+    return bundle
+
+
+def load_scaler(path=PREPROCESSING_PATH, model_path=MODEL_PATH, verify=True):
+    bundle = load_bundle(path, model_path, verify)
+    return Scaler(bundle['mean'], bundle['scale'], bundle['feature_names'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the preprocessing bundle for the model")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="encoded training CSV or columnar directory")
+    parser.add_argument('--model', default=MODEL_PATH, help="model file the bundle belongs to")
+    parser.add_argument('--output', default=PREPROCESSING_PATH, help="where to write the bundle")
+    args = parser.parse_args(argv)
+
+    bundle = build_bundle(args.data, args.model)
+    save_bundle(bundle, args.output)
+    print(f"Wrote {args.output} (model sha256 {bundle['model_sha256'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
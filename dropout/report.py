@@ -0,0 +1,322 @@
+"""Intervention plans for a whole cohort as printable HTML.
+
+The cards of the app's intervention plan are plain format-string templates.
+Cards whose rule has a fixed description are rendered once per rule, and
+only the semester cards format in the student's course counts. Risk areas
+come from dropout.rules for all students at once, and rendering is split
+across a process pool:
+
+    python -m dropout.report students.csv -o plans.html        # one document
+    python -m dropout.report students.csv -o plans/            # a file per student
+
+A single document carries the stylesheet once and breaks pages between
+students, so printing it to PDF gives one plan per page. A directory gets
+one plan.css that every student's page links to.
+"""
+
+import argparse
+import functools
+import html
+import os
+import re
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from dropout.features import MODEL_PATH, PREPROCESSING_PATH
+from dropout.rules import INTERVENTION_RULES, matched
+from dropout.styles import PLAN_CSS, PRINT_CSS, minify_css
+
+DEFAULT_CHUNK_SIZE = 2_000
+
+# (lower bound, label, css class, icon), first match wins
+RISK_LEVELS = [
+    (0.8, "High Risk", "risk-high", "⚠️"),
+    (0.6, "Medium Risk", "risk-medium", "⚠️"),
+    (-np.inf, "Low Risk", "risk-low", "✓"),
+]
+
+SECTION_HEADER = """
+<div class="section-header">
+    <div class="section-icon">{icon}</div>
+    {title}
+</div>
+"""
+
+OVERVIEW_CARD = """
+<div class="risk-card">
+    <div class="risk-header">
+        <div class="risk-icon">{icon}</div>
+        <div class="risk-title">Risk Profile <span class="risk-badge {css_class}">{level}</span></div>
+    </div>
+    <div class="risk-description">
+        Based on our predictive model analysis, this student has a dropout probability of <strong>{probability:.1%}</strong>.
+    </div>
+</div>
+"""
+
+AREA_CARD = """
+<div class="risk-card">
+    <div class="risk-header">
+        <div class="risk-icon">{icon}</div>
+        <div class="risk-title">{area}</div>
+    </div>
+    <div class="risk-description">{description}</div>
+    <div class="interventions-container">
+        {interventions}
+    </div>
+</div>
+"""
+
+INTERVENTION_ITEM = '<div class="intervention-item"><div class="intervention-bullet">•</div><div class="intervention-text">{}</div></div>'
+
+TIMELINE = """
+<div class="timeline-card">
+    <div class="timeline-header">
+        <div class="timeline-icon">🔵</div>
+        Immediate (Next 7 days)
+    </div>
+    <div class="timeline-items">
+        <div class="timeline-item">• Initial contact with student via email and phone</div>
+        <div class="timeline-item">• Schedule first advising appointment</div>
+        <div class="timeline-item">• Provide resource information packet</div>
+    </div>
+</div>
+<div class="timeline-card">
+    <div class="timeline-header">
+        <div class="timeline-icon">🔵</div>
+        Short-term (2-4 weeks)
+    </div>
+    <div class="timeline-items">
+        <div class="timeline-item">• Complete all initial consultations for identified risk areas</div>
+        <div class="timeline-item">• Establish regular check-in schedule</div>
+        <div class="timeline-item">• Set measurable goals for improvement</div>
+    </div>
+</div>
+<div class="timeline-card">
+    <div class="timeline-header">
+        <div class="timeline-icon">🔵</div>
+        Long-term (Semester)
+    </div>
+    <div class="timeline-items">
+        <div class="timeline-item">• Monthly progress assessment</div>
+        <div class="timeline-item">• Intervention strategy adjustments as needed</div>
+        <div class="timeline-item">• End-of-semester comprehensive review</div>
+    </div>
+</div>
+"""
+
+RULES_BY_AREA = {rule["area"]: rule for rule in INTERVENTION_RULES}
+
+LOW_RISK_NOTE = "This student has a low risk profile. No specific interventions required at this time, but regular academic advising is recommended."
+
+PLAN = """<section class="plan-container">
+<h1 class="plan-title">Personalized Intervention Plan: {student}</h1>
+{body}
+</section>
+"""
+
+DOCUMENT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{style}
+</head>
+<body>
+{plans}
+</body>
+</html>
+"""
+
+ASSESSMENT_HEADER = SECTION_HEADER.format(icon="📊", title="Student Risk Assessment")
+AREAS_HEADER = SECTION_HEADER.format(icon="🎯", title="Targeted Intervention Areas")
+TIMELINE_HEADER = SECTION_HEADER.format(icon="⏱️", title="Implementation Timeline")
+
+
+def risk_level(dropout_probability):
+    """(label, css class, icon) of the plan's risk badge"""
+    for bound, level, css_class, icon in RISK_LEVELS:
+        if dropout_probability > bound:
+            return level, css_class, icon
+
+
+def overview_card(dropout_probability):
+    level, css_class, icon = risk_level(dropout_probability)
+    return OVERVIEW_CARD.format(icon=icon, css_class=css_class, level=level, probability=dropout_probability)
+
+
+def area_card(area):
+    """Card for one risk area: an INTERVENTION_RULES entry with its description filled in"""
+    return AREA_CARD.format(
+        icon=area["icon"],
+        area=area["area"],
+        description=area["description"],
+        interventions="".join(INTERVENTION_ITEM.format(item) for item in area["interventions"]),
+    )
+
+
+def escape_braces(text):
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+@functools.lru_cache(maxsize=None)
+def area_template(area):
+    """Card template of one risk area with everything but the description's fields filled in"""
+    rule = RULES_BY_AREA[area]
+    return escape_braces(area_card({**rule, "description": "\0"})).replace("\0", rule["description"])
+
+
+def card_templates():
+    """Area card templates in INTERVENTION_RULES order"""
+    return [area_template(rule["area"]) for rule in INTERVENTION_RULES]
+
+
+def description_fields(rules=INTERVENTION_RULES):
+    """Student columns the rule descriptions format in"""
+    return sorted({
+        field for rule in rules for _, field, _, _ in string.Formatter().parse(rule["description"]) if field
+    })
+
+
+def plan_body(dropout_probability, fired, values, cards, note=True):
+    """Overview, area cards and timeline of one plan
+
+    fired: the student's row of the intervention rule matrix
+    values: the student's description fields
+    cards: templates from card_templates
+    note: add the low-risk note when no area fired
+    """
+    parts = [ASSESSMENT_HEADER, overview_card(dropout_probability)]
+    areas = [cards[j].format_map(values) for j in np.flatnonzero(fired)]
+    if areas:
+        parts += [AREAS_HEADER, *areas, TIMELINE_HEADER, TIMELINE]
+    elif note:
+        parts.append(f'<div class="risk-description">{LOW_RISK_NOTE}</div>')
+    return "".join(parts)
+
+
+def render_plan(student, dropout_probability, fired, values, cards):
+    """One student's plan section for the bulk documents"""
+    return PLAN.format(student=html.escape(str(student)), body=plan_body(dropout_probability, fired, values, cards))
+
+
+def page_filename(student):
+    """File of one student's page, characters other than letters, digits, '.', '_' and '-' replaced"""
+    return re.sub(r'[^\w.-]', '_', str(student)) + ".html"
+
+
+def check_filenames(ids):
+    """Raise ValueError when two students' pages would go to the same file"""
+    _, inverse, counts = np.unique([page_filename(student) for student in ids],
+                                   return_inverse=True, return_counts=True)
+    if (counts > 1).any():
+        clashing = [str(student) for student, i in zip(ids, inverse) if counts[i] > 1]
+        raise ValueError(f"Student IDs share a page file name: {', '.join(clashing[:10])}")
+
+
+def render_chunk(students, probabilities, fired, values, output_dir=None):
+    """Render a slice of the cohort
+
+    Returns the plans joined and UTF-8 encoded, which keeps memory and
+    transfer between processes small, or with output_dir writes one page per
+    student there and returns how many were written.
+    """
+    cards = card_templates()
+    fields = list(values)
+    plans = []
+    for i, student in enumerate(students):
+        plan = render_plan(student, probabilities[i], fired[i], {f: values[f][i] for f in fields}, cards)
+        if output_dir is None:
+            plans.append(plan)
+        else:
+            page = DOCUMENT.format(title=html.escape(f"Intervention plan {student}"),
+                                   style='<link rel="stylesheet" href="plan.css">', plans=plan)
+            Path(output_dir, page_filename(student)).write_text(page, encoding="utf-8")
+    return "".join(plans).encode("utf-8") if output_dir is None else len(students)
+
+
+def _render_chunk(args):
+    return render_chunk(*args)
+
+
+def render_plans(df, dropout_probability, ids=None, output_dir=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield render_chunk results for consecutive slices of df, in input order"""
+    ids = np.arange(len(df)) if ids is None else np.asarray(ids)
+    if output_dir is not None:
+        check_filenames(ids.tolist())
+    fired = matched(df, INTERVENTION_RULES, dropout_probability)
+    # Plain Python values so the counts format as in the app
+    values = {field: df[field].tolist() for field in description_fields()}
+    probabilities = np.asarray(dropout_probability, dtype=np.float64).tolist()
+    chunks = (
+        (ids[start:start + chunk_size].tolist(), probabilities[start:start + chunk_size], fired[start:start + chunk_size],
+         {f: v[start:start + chunk_size] for f, v in values.items()}, output_dir)
+        for start in range(0, len(df), chunk_size)
+    )
+    if workers <= 1 or len(df) <= chunk_size:
+        yield from (render_chunk(*chunk) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            yield from pool.map(_render_chunk, chunks)
+
+
+def write_document(path, chunks, title="Intervention plans"):
+    """Stream encoded plan chunks into one HTML document with the stylesheet included once"""
+    head, tail = DOCUMENT.format(
+        title=html.escape(title), style=f"<style>{minify_css(PLAN_CSS + PRINT_CSS)}</style>", plans="\0",
+    ).split("\0")
+    with open(path, "wb") as f:
+        f.write(head.encode("utf-8"))
+        for chunk in chunks:
+            f.write(chunk)
+        f.write(tail.encode("utf-8"))
+
+
+def main(argv=None):
+    from dropout.scoring import BACKENDS, THRESHOLD, feature_matrix, load_pipeline, predict_batch, read_table
+
+    parser = argparse.ArgumentParser(description="Render intervention plans for every at-risk student in a cohort")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with the 36 feature columns")
+    parser.add_argument('-o', '--output', required=True,
+                        help="HTML file for one document, or a directory for one file per student")
+    parser.add_argument('--sep', default=',', help="CSV delimiter (use ';' for data/data.csv)")
+    parser.add_argument('--id-column', default=None, help="column naming each plan (default: row number)")
+    parser.add_argument('--min-probability', type=float, default=1 - THRESHOLD,
+                        help="dropout probability from which a student gets a plan")
+    parser.add_argument('--all', action='store_true', help="render a plan for every student")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of rendering processes")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    args = parser.parse_args(argv)
+
+    df = read_table(args.input, sep=args.sep)
+    model, scaler = load_pipeline(args.backend, args.model, args.preprocessing)
+    _, probabilities = predict_batch(feature_matrix(df), model, scaler)
+    dropout_probability = probabilities[:, 0]
+    ids = df[args.id_column].to_numpy() if args.id_column else np.arange(len(df))
+
+    selected = np.ones(len(df), dtype=bool) if args.all else dropout_probability >= args.min_probability
+    df, dropout_probability, ids = df[selected].reset_index(drop=True), dropout_probability[selected], ids[selected]
+
+    start = time.perf_counter()
+    if args.output.lower().endswith(('.html', '.htm')):
+        write_document(args.output, render_plans(df, dropout_probability, ids, None, args.workers, args.chunk_size))
+    else:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        Path(args.output, "plan.css").write_text(minify_css(PLAN_CSS + PRINT_CSS), encoding="utf-8")
+        sum(render_plans(df, dropout_probability, ids, args.output, args.workers, args.chunk_size))
+    elapsed = time.perf_counter() - start
+
+    print(f"Rendered {len(df):,} plans to {args.output} in {elapsed:.2f}s "
+          f"({len(df) / max(elapsed, 1e-9):,.0f} plans/s)")
+
+
+if __name__ == '__main__':
+    main()
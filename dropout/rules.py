@@ -0,0 +1,226 @@
+"""Rule engine for risk areas, interventions and rule-of-thumb risk factors.
+
+The rules the app used to check one student at a time are kept here as
+tables. Each rule fires when any of its (column, operator, value) clauses
+holds, and every clause is one NumPy comparison over a whole column, so a
+cohort of any size costs a few array operations per rule:
+
+    python -m dropout.rules students.csv -o plans.csv
+
+Clauses may use the feature columns, the derived pass rates below, and
+Dropout_probability when the caller passes model probabilities. The app
+evaluates the same tables for a single student.
+"""
+
+import argparse
+import operator
+import time
+
+import numpy as np
+
+from dropout.features import MODEL_PATH, PREPROCESSING_PATH
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Columns computed from the features before the rules are evaluated
+DERIVED = {
+    'Pass_rate_1st_sem': ('Curricular_units_1st_sem_approved', 'Curricular_units_1st_sem_enrolled'),
+    'Pass_rate_2nd_sem': ('Curricular_units_2nd_sem_approved', 'Curricular_units_2nd_sem_enrolled'),
+}
+
+# Areas of the intervention plan. A fallback rule only fires for students
+# no other rule matched.
+INTERVENTION_RULES = [
+    {
+        "area": "Academic Performance (1st Semester)",
+        "icon": "📚",
+        "when": [('Pass_rate_1st_sem', '<', 0.6)],
+        "description": "Student passed only {Curricular_units_1st_sem_approved} of {Curricular_units_1st_sem_enrolled} courses.",
+        "interventions": [
+            "Weekly meetings with an academic advisor",
+            "Enrollment in supplemental instruction sessions",
+            "Consideration for course load reduction"
+        ]
+    },
+    {
+        "area": "Academic Performance (2nd Semester)",
+        "icon": "📝",
+        "when": [('Pass_rate_2nd_sem', '<', 0.6)],
+        "description": "Student passed only {Curricular_units_2nd_sem_approved} of {Curricular_units_2nd_sem_enrolled} courses.",
+        "interventions": [
+            "Mandatory tutoring sessions for difficult subjects",
+            "Mid-semester progress review with program coordinator",
+            "Study skills workshop attendance"
+        ]
+    },
+    {
+        "area": "Financial Stability",
+        "icon": "💰",
+        "when": [('Debtor', '==', 1), ('Tuition_fees_up_to_date', '==', 0)],
+        "description": "Student has financial difficulties with tuition payments.",
+        "interventions": [
+            "Financial aid office consultation",
+            "Payment plan options review",
+            "Emergency scholarship or grant application",
+            "Part-time campus employment opportunities"
+        ]
+    },
+    {
+        "area": "Social Integration",
+        "icon": "👥",
+        "when": [('International', '==', 1), ('Displaced', '==', 1)],
+        "description": "Student may face adjustment challenges due to international/displaced status.",
+        "interventions": [
+            "Connection with student communities for similar backgrounds",
+            "Regular check-ins with international student office",
+            "Cultural transition support group",
+            "Mentor matching program"
+        ]
+    },
+    {
+        "area": "Multiple Factors",
+        "icon": "🔍",
+        "when": [('Dropout_probability', '>', 0.5)],
+        "fallback": True,
+        "description": "No single major risk factor identified, but combination of minor factors increases dropout risk.",
+        "interventions": [
+            "Holistic student success meeting with advisor",
+            "Regular progress monitoring",
+            "Student engagement opportunities assessment",
+            "Academic and personal goal-setting workshop"
+        ]
+    },
+]
+
+# Risk factors listed for a high-risk student when the model cannot explain itself
+RISK_FACTOR_RULES = [
+    {"label": "Low pass rate in 1st semester courses", "when": [('Pass_rate_1st_sem', '<', 0.5)]},
+    {"label": "Low pass rate in 2nd semester courses", "when": [('Pass_rate_2nd_sem', '<', 0.5)]},
+    {"label": "Below average grades in 1st semester", "when": [('Curricular_units_1st_sem_grade', '<', 11)]},
+    {"label": "Below average grades in 2nd semester", "when": [('Curricular_units_2nd_sem_grade', '<', 11)]},
+    {"label": "Has tuition debt", "when": [('Debtor', '==', 1)]},
+    {"label": "Tuition fees not up to date", "when": [('Tuition_fees_up_to_date', '==', 0)]},
+]
+
+
+def rule_columns(rules):
+    """Input columns the rules read, derived ones expanded to their sources"""
+    names = []
+    for rule in rules:
+        for column, _, _ in rule['when']:
+            for name in DERIVED.get(column, (column,)):
+                if name not in names:
+                    names.append(name)
+    return names
+
+
+def prepare_columns(data, rules, dropout_probability=None):
+    """Float64 column arrays for the rules from a DataFrame or one student's dict"""
+    columns = {}
+    for name in rule_columns(rules):
+        if name == 'Dropout_probability':
+            continue
+        if name not in data:
+            raise ValueError(f"Input is missing rule column {name!r}")
+        columns[name] = np.atleast_1d(np.asarray(data[name], dtype=np.float64))
+    for name, (approved, enrolled) in DERIVED.items():
+        if approved in columns:
+            columns[name] = columns[approved] / np.maximum(columns[enrolled], 1)
+    if dropout_probability is not None:
+        columns['Dropout_probability'] = np.atleast_1d(np.asarray(dropout_probability, dtype=np.float64))
+    return columns
+
+
+def evaluate(columns, rules):
+    """(n, len(rules)) boolean matrix of which rules fire for each student
+
+    Rules reading a column that is absent (Dropout_probability without
+    probabilities) never fire.
+    """
+    n = len(next(iter(columns.values())))
+    fired = np.zeros((n, len(rules)), dtype=bool)
+    for j, rule in enumerate(rules):
+        if all(column in columns for column, _, _ in rule['when']):
+            for column, op, value in rule['when']:
+                fired[:, j] |= OPERATORS[op](columns[column], value)
+    fallback = np.array([rule.get('fallback', False) for rule in rules])
+    if fallback.any():
+        fired[:, fallback] &= ~fired[:, ~fallback].any(axis=1, keepdims=True)
+    return fired
+
+
+def matched(data, rules, dropout_probability=None):
+    return evaluate(prepare_columns(data, rules, dropout_probability), rules)
+
+
+def risk_factor_labels(student):
+    """Rule-of-thumb risk factors for one student"""
+    fired = matched(student, RISK_FACTOR_RULES)[0]
+    return [rule["label"] for rule, hit in zip(RISK_FACTOR_RULES, fired) if hit]
+
+
+def join_fired(fired, texts, sep='; '):
+    """Per-row strings joining the texts of the fired rules
+
+    Rows are grouped by their combination of fired rules, so the strings are
+    built once per distinct combination rather than once per student.
+    """
+    codes = fired.astype(np.int64) @ (1 << np.arange(fired.shape[1], dtype=np.int64))
+    combos, inverse = np.unique(codes, return_inverse=True)
+    joined = np.array(
+        [sep.join(text for j, text in enumerate(texts) if code >> j & 1) for code in combos],
+        dtype=object,
+    )
+    return joined[inverse.reshape(-1)]
+
+
+def with_plans(df, dropout_probability=None):
+    """Append risk areas, interventions and rule-based risk factors as columns"""
+    fired = matched(df, INTERVENTION_RULES, dropout_probability)
+    factors = matched(df, RISK_FACTOR_RULES)
+    out = df.copy()
+    out['Risk_area_count'] = fired.sum(axis=1)
+    out['Risk_areas'] = join_fired(fired, [rule["area"] for rule in INTERVENTION_RULES])
+    out['Interventions'] = join_fired(fired, ["; ".join(rule["interventions"]) for rule in INTERVENTION_RULES])
+    out['Rule_risk_factors'] = join_fired(factors, [rule["label"] for rule in RISK_FACTOR_RULES])
+    return out
+
+
+def main(argv=None):
+    from dropout.scoring import BACKENDS, feature_matrix, load_pipeline, predict_batch, read_table, write_table
+
+    parser = argparse.ArgumentParser(description="Append each student's risk areas and interventions")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with the 36 feature columns")
+    parser.add_argument('-o', '--output', required=True, help="CSV or Parquet file to write")
+    parser.add_argument('--sep', default=',', help="CSV delimiter (use ';' for data/data.csv)")
+    parser.add_argument('--no-score', action='store_true',
+                        help="skip the model; the probability-based fallback area is never assigned")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    args = parser.parse_args(argv)
+
+    df = read_table(args.input, sep=args.sep)
+    dropout_probability = None
+    if not args.no_score:
+        model, scaler = load_pipeline(args.backend, args.model, args.preprocessing)
+        _, probabilities = predict_batch(feature_matrix(df), model, scaler)
+        dropout_probability = probabilities[:, 0]
+    start = time.perf_counter()
+    out = with_plans(df, dropout_probability)
+    elapsed = time.perf_counter() - start
+    write_table(out, args.output)
+
+    flagged = int((out['Risk_area_count'] > 0).sum())
+    print(f"Evaluated rules for {len(df):,} rows in {elapsed:.2f}s, {flagged:,} with at least one risk area")
+
+
+if __name__ == '__main__':
+    main()
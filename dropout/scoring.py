@@ -0,0 +1,150 @@
+"""Vectorized batch scoring for whole cohorts.
+
+Score a CSV or Parquet file holding the 36 feature columns:
+
+    python -m dropout.scoring students.csv -o scored.csv
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dropout.features import FEATURE_NAMES, LABELS, MODEL_PATH, PREPROCESSING_PATH
+from dropout.preprocessing import Passthrough, load_scaler
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Same cut-off XGBClassifier.predict uses for binary:logistic
+THRESHOLD = 0.5
+
+# joblib: pickled XGBClassifier + preprocessing bundle
+# folded: booster with the scaler folded into its thresholds (python -m dropout.fold)
+# compiled: NumPy tree evaluator, no xgboost/sklearn import (python -m dropout.export)
+BACKENDS = ('joblib', 'folded', 'compiled')
+
+
+def load_model(path=MODEL_PATH):
+    import joblib
+
+    return joblib.load(path)
+
+
+def load_backend_model(backend='joblib', model_path=MODEL_PATH):
+    if backend == 'joblib':
+        return load_model(model_path)
+    if backend == 'folded':
+        from dropout.fold import load_folded
+        return load_folded(model_path=model_path)
+    if backend == 'compiled':
+        from dropout.export import load_compiled
+        return load_compiled(model_path=model_path)
+    raise ValueError(f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def load_backend_scaler(backend='joblib', model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH):
+    # Folded and compiled models take raw features
+    if backend == 'joblib':
+        return load_scaler(preprocessing_path, model_path)
+    return Passthrough()
+
+
+def load_pipeline(backend='joblib', model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH):
+    """Return the (model, scaler) pair for a serving backend"""
+    return (
+        load_backend_model(backend, model_path),
+        load_backend_scaler(backend, model_path, preprocessing_path),
+    )
+
+
+def feature_matrix(df):
+    """Select the model features from a DataFrame in training order"""
+    missing = [name for name in FEATURE_NAMES if name not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {', '.join(missing)}")
+    return df[FEATURE_NAMES].to_numpy(dtype=np.float64)
+
+
+def predict_batch(X, model, scaler):
+    """Scale and score a feature matrix with a single predict_proba pass
+
+    Returns the predicted classes and the (n, 2) probability matrix, matching
+    model.predict and model.predict_proba.
+    """
+    probability = model.predict_proba(scaler.transform(X))
+    prediction = (probability[:, 1] > THRESHOLD).astype(np.int64)
+    return prediction, probability
+
+
+def score_blocks(df, model, scaler, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield consecutive blocks of df's rows with prediction and probability columns appended
+
+    Only one block is copied at a time, so a frame viewing a memory-mapped
+    columnar dataset is read block by block instead of made resident whole.
+    """
+    # At least one block, so an empty input still yields its columns
+    for start in range(0, max(len(df), 1), chunk_size):
+        block = df.iloc[start:start + chunk_size]
+        predictions, probabilities = predict_batch(feature_matrix(block), model, scaler)
+        yield with_scores(block, predictions, probabilities.astype(np.float64))
+
+
+def with_scores(df, predictions, probabilities):
+    out = df.copy()
+    out['Dropout_probability'] = probabilities[:, 0]
+    out['Graduate_probability'] = probabilities[:, 1]
+    out['Prediction'] = predictions
+    out['Predicted_status'] = [LABELS[p] for p in predictions]
+    return out
+
+
+def read_table(path, sep=','):
+    import pandas as pd
+
+    from dropout.columnar import is_columnar, load_frame
+
+    if is_columnar(path):
+        return load_frame(path)
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, sep=sep)
+
+
+def write_table(df, path):
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a cohort file with the dropout model")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with the 36 feature columns")
+    parser.add_argument('-o', '--output', required=True, help="CSV or Parquet file to write")
+    parser.add_argument('--sep', default=',', help="CSV delimiter (use ';' for data/data.csv)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    args = parser.parse_args(argv)
+
+    model, scaler = load_pipeline(args.backend, args.model, args.preprocessing)
+    df = read_table(args.input, sep=args.sep)
+
+    from dropout.streaming import ChunkWriter
+
+    start = time.perf_counter()
+    writer = ChunkWriter(args.output)
+    try:
+        for block in score_blocks(df, model, scaler, chunk_size=args.chunk_size):
+            writer.write(block)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored and wrote {len(df)} rows in {elapsed:.2f}s ({len(df) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
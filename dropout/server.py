@@ -0,0 +1,365 @@
+"""Local HTTP/JSON prediction service with micro-batching.
+
+Concurrent single-student requests are queued and coalesced into one
+vectorized predict_proba call per batch window. Uses only asyncio from the
+standard library, so it adds no dependencies on top of the model itself.
+The model is reloaded when its artifacts change on disk, so retraining does
+not need a restart. A reload that fails keeps the loaded model serving and is
+retried after --reload-retry-s; until a model has loaded, /predict answers 503.
+
+    python -m dropout.server --port 8000
+
+Endpoints:
+    POST /predict   one feature dict, or a list of them
+    GET  /metrics   request count, throughput, p50/p99 latency, batch sizes
+    GET  /health
+"""
+
+import argparse
+import asyncio
+import collections
+import functools
+import json
+import sys
+import time
+
+import numpy as np
+
+from dropout.cache import DEFAULT_MAXSIZE, DEFAULT_TTL, PredictionCache, artifact_fingerprint
+from dropout.features import COMPILED_MODEL_PATH, FEATURE_NAMES, FOLDED_MODEL_PATH, LABELS, MODEL_PATH, PREPROCESSING_PATH
+from dropout.scoring import BACKENDS, load_pipeline, predict_batch
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+RELOAD_RETRY_S = 5.0
+
+
+class ModelUnavailable(Exception):
+    """No model has loaded yet, answered with 503"""
+
+
+def features_to_row(features):
+    """Turn a feature dict into a row in training order"""
+    if not isinstance(features, dict):
+        raise ValueError("each student must be a JSON object of feature values")
+    missing = [name for name in FEATURE_NAMES if name not in features]
+    if missing:
+        raise ValueError(f"missing features: {', '.join(missing)}")
+    return [float(features[name]) for name in FEATURE_NAMES]
+
+
+def content_length(headers):
+    """Body length from the Content-Length header, None when it is not a non-negative integer"""
+    value = headers.get('content-length', '0') or '0'
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+def prediction_payload(prediction, probability):
+    prediction = int(prediction)
+    return {
+        'prediction': prediction,
+        'label': LABELS[prediction],
+        'probability': [float(p) for p in probability],
+    }
+
+
+class Metrics:
+    """Rolling latency window plus request and batch counters"""
+
+    def __init__(self, window=10_000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.predictions = 0
+        self.batches = 0
+        self.latencies = collections.deque(maxlen=window)
+        self.batch_sizes = collections.deque(maxlen=window)
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        latencies = np.asarray(self.latencies) * 1000
+        batch_sizes = np.asarray(self.batch_sizes)
+        return {
+            'uptime_s': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'predictions': self.predictions,
+            'batches': self.batches,
+            'throughput_rps': round(self.requests / uptime, 2) if uptime else 0.0,
+            'latency_ms': {
+                'p50': round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+                'p99': round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None,
+            },
+            'mean_batch_size': round(float(batch_sizes.mean()), 2) if len(batch_sizes) else None,
+        }
+
+
+class MicroBatcher:
+    """Coalesce queued rows into one predict_batch call per time window"""
+
+    def __init__(self, model, scaler, metrics, max_batch=256, max_wait=0.002):
+        self.model = model
+        self.scaler = scaler
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, rows):
+        """Queue rows and wait for their (prediction, probability) pairs"""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            future = loop.create_future()
+            self.queue.put_nowait((row, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            X = np.asarray([row for row, _ in batch], dtype=np.float64)
+            try:
+                # Run the booster off the event loop so new requests keep queueing
+                predictions, probabilities = await loop.run_in_executor(
+                    None, predict_batch, X, self.model, self.scaler
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.metrics.batches += 1
+            self.metrics.predictions += len(batch)
+            self.metrics.batch_sizes.append(len(batch))
+            for (_, future), prediction, probability in zip(batch, predictions, probabilities):
+                if not future.done():
+                    future.set_result((prediction, probability))
+
+
+class PredictionServer:
+    """Minimal HTTP/1.1 JSON server on top of asyncio streams"""
+
+    def __init__(self, batcher, metrics, cache=None, loader=None, artifacts=(), reload_retry_s=RELOAD_RETRY_S):
+        """loader: returns a fresh (model, scaler) when any of the artifacts paths changes"""
+        self.batcher = batcher
+        self.metrics = metrics
+        self.cache = cache
+        self.loader = loader
+        self.artifacts = artifacts
+        self.reload_retry_s = reload_retry_s
+        # Fingerprint of the loaded model's artifacts, None until one is loaded
+        self.fingerprint = artifact_fingerprint(*artifacts) if artifacts and batcher.model is not None else None
+        self._retry_at = 0.0
+        self._reload_lock = asyncio.Lock()
+
+    def _reload_due(self):
+        return artifact_fingerprint(*self.artifacts) != self.fingerprint and time.monotonic() >= self._retry_at
+
+    async def refresh(self):
+        """Reload the model if its artifacts changed on disk, return the loaded model's fingerprint
+
+        A failed reload, e.g. of a half-written retrain, keeps the current
+        model and is retried reload_retry_s later.
+        """
+        if self.loader is None or not self._reload_due():
+            return self.fingerprint
+        async with self._reload_lock:
+            if self._reload_due():
+                fingerprint = artifact_fingerprint(*self.artifacts)
+                try:
+                    model, scaler = await asyncio.get_running_loop().run_in_executor(None, self.loader)
+                except Exception as e:
+                    self._retry_at = time.monotonic() + self.reload_retry_s
+                    keeping = "keeping the loaded model" if self.batcher.model is not None else "no model loaded"
+                    print(f"Reloading the model failed ({keeping}), retrying in {self.reload_retry_s:g}s: {e}",
+                          file=sys.stderr)
+                else:
+                    self.batcher.model, self.batcher.scaler = model, scaler
+                    self.fingerprint = fingerprint
+        return self.fingerprint
+
+    async def handle_predict(self, body):
+        payload = json.loads(body or b'null')
+        students = payload if isinstance(payload, list) else [payload]
+        rows = [features_to_row(student) for student in students]
+
+        # Only rows missing from the cache go through the model
+        fingerprint = await self.refresh()
+        if self.batcher.model is None:
+            raise ModelUnavailable("no model is loaded yet")
+        results = [None] * len(rows)
+        if self.cache is not None:
+            for i, student in enumerate(students):
+                results[i] = self.cache.get(student, fingerprint)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            for i, result in zip(pending, await self.batcher.predict([rows[i] for i in pending])):
+                results[i] = prediction_payload(*result)
+                if self.cache is not None:
+                    self.cache.put(students[i], results[i], fingerprint)
+
+        return results if isinstance(payload, list) else results[0]
+
+    async def dispatch(self, method, path, body):
+        if path == '/predict':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            try:
+                return 200, await self.handle_predict(body)
+            except ModelUnavailable as e:
+                return 503, {'error': str(e)}
+            except (ValueError, TypeError) as e:
+                return 400, {'error': str(e)}
+        if path == '/metrics' and method == 'GET':
+            snapshot = self.metrics.snapshot()
+            if self.cache is not None:
+                snapshot['cache'] = self.cache.stats()
+            return 200, snapshot
+        if path == '/health' and method == 'GET':
+            if self.batcher.model is None:
+                return 503, {'status': 'no model loaded'}
+            return 200, {'status': 'ok'}
+        return 404, {'error': f'no route for {method} {path}'}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = content_length(headers)
+                body = await reader.readexactly(length) if length is not None else b''
+
+                start = time.perf_counter()
+                if length is None:
+                    # The body cannot be framed, so the connection is closed below
+                    status, result = 400, {'error': 'invalid Content-Length header'}
+                else:
+                    try:
+                        status, result = await self.dispatch(method, path.split('?', 1)[0], body)
+                    except Exception as e:
+                        status, result = 500, {'error': str(e)}
+                if path.startswith('/predict'):
+                    self.metrics.requests += 1
+                    self.metrics.latencies.append(time.perf_counter() - start)
+                    if status != 200:
+                        self.metrics.errors += 1
+
+                keep_alive = (
+                    length is not None
+                    and headers.get('connection', '').lower() != 'close'
+                    and version.upper() == 'HTTP/1.1'
+                )
+                data = json.dumps(result).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8000, max_batch=256, max_wait_ms=2.0,
+                model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH,
+                cache_size=DEFAULT_MAXSIZE, cache_ttl=DEFAULT_TTL, backend='joblib', reload_retry_s=RELOAD_RETRY_S):
+    try:
+        model, scaler = load_pipeline(backend, model_path, preprocessing_path)
+    except Exception as e:
+        # Serve 503 until the artifacts become loadable rather than refusing to start
+        print(f"Could not load the model, retrying every {reload_retry_s:g}s: {e}", file=sys.stderr)
+        model = scaler = None
+    metrics = Metrics()
+    batcher = MicroBatcher(model, scaler, metrics, max_batch=max_batch, max_wait=max_wait_ms / 1000)
+    cache = PredictionCache(cache_size, cache_ttl) if cache_size > 0 else None
+    # Folded and compiled backends are checked against model_path when loaded
+    artifacts = (model_path, preprocessing_path, FOLDED_MODEL_PATH, COMPILED_MODEL_PATH)
+    loader = functools.partial(load_pipeline, backend, model_path, preprocessing_path)
+    app = PredictionServer(batcher, metrics, cache, loader, artifacts, reload_retry_s)
+
+    batcher.start()
+    server = await asyncio.start_server(app.handle_connection, host, port)
+    print(f"Serving predictions on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local prediction HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=256, help="largest micro-batch per model call")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help="how long to wait for a batch to fill")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAXSIZE, help="prediction cache entries, 0 disables it")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL, help="seconds before a cached prediction expires")
+    parser.add_argument('--reload-retry-s', type=float, default=RELOAD_RETRY_S,
+                        help="seconds before retrying a model reload that failed")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms,
+                          args.model, args.preprocessing, args.cache_size, args.cache_ttl, args.backend,
+                          args.reload_retry_s))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""Import-time and time-to-first-render profile of the Streamlit app.
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported or cached:
+
+- import: `import app` outside `streamlit run`, with the slowest modules
+  from `python -X importtime`;
+- render: one full script run through Streamlit's AppTest, timing the first
+  element sent to the browser and the end of the run;
+- interaction: submitting the form, adding a feature to the what-if
+  explorer and generating the intervention plan, with the bytes of messages
+  each step sends to the browser. Clicks on
+  widgets inside an st.fragment are replayed as fragment-scoped reruns, as
+  the browser would send them. This patches private Streamlit internals,
+  which are checked first; a Streamlit without them stops the profile with
+  a message naming what is missing.
+
+Results use the dropout.bench JSON format, so two runs can be compared:
+
+    python -m dropout.startup -o startup.json
+    python -m dropout.bench compare startup_before.json startup.json
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+
+from dropout.bench import metric
+from dropout.features import ROOT
+
+# The render and interaction scripts patch private Streamlit internals; check
+# them first so a Streamlit release that moved one fails with a clear message
+REQUIRE_INTERNALS = """
+import importlib, streamlit
+
+def require(module, path, fields=()):
+    try:
+        obj = importlib.import_module(module)
+        for name in path.split('.'):
+            obj = getattr(obj, name)
+        missing = [field for field in fields if field not in obj.__dataclass_fields__]
+    except (ImportError, AttributeError):
+        missing = [path]
+    if missing:
+        raise SystemExit(f"dropout.startup patches {module}.{path}, but Streamlit {streamlit.__version__} "
+                         f"lacks {', '.join(missing)}; install the Streamlit version in requirements.txt")
+"""
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit.config, streamlit.logger
+streamlit.config.get_config_options()
+streamlit.logger.set_log_level('error')
+framework = time.perf_counter()
+import app
+done = time.perf_counter()
+heavy = [name for name in ('pandas', 'numpy', 'sklearn', 'xgboost', 'joblib', 'scipy') if name in sys.modules]
+print(json.dumps({'streamlit_s': framework - start, 'app_s': done - framework, 'heavy': heavy}))
+"""
+
+RENDER_SCRIPT = REQUIRE_INTERNALS + """
+require('streamlit.delta_generator', 'DeltaGenerator._enqueue')
+import json, time
+from streamlit.delta_generator import DeltaGenerator
+from streamlit.testing.v1 import AppTest
+
+first = []
+enqueue = DeltaGenerator._enqueue
+
+def timed_enqueue(self, *args, **kwargs):
+    if not first:
+        first.append(time.perf_counter())
+    return enqueue(self, *args, **kwargs)
+
+DeltaGenerator._enqueue = timed_enqueue
+at = AppTest.from_file('app.py', default_timeout=120)
+start = time.perf_counter()
+at.run()
+done = time.perf_counter()
+print(json.dumps({
+    'first_render_s': first[0] - start if first else None,
+    'full_run_s': done - start,
+    'exceptions': [str(e.value) for e in at.exception],
+}))
+"""
+
+INTERACTION_SCRIPT = REQUIRE_INTERNALS + """
+require('streamlit.runtime.forward_msg_queue', 'ForwardMsgQueue.enqueue')
+require('streamlit.runtime.scriptrunner_utils.script_requests', 'RerunData',
+        fields=('fragment_id_queue', 'is_fragment_scoped_rerun'))
+require('streamlit.testing.v1.local_script_runner', 'RerunData')
+import json, time
+import streamlit.testing.v1.local_script_runner as local_script_runner
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import AppTest
+
+sent = []
+enqueue = ForwardMsgQueue.enqueue
+
+def recording_enqueue(self, msg):
+    sent.append(msg)
+    return enqueue(self, msg)
+
+ForwardMsgQueue.enqueue = recording_enqueue
+
+scoped = []
+
+def rerun_data(**kwargs):
+    if scoped:
+        kwargs.update(fragment_id_queue=list(scoped), is_fragment_scoped_rerun=True)
+    return RerunData(**kwargs)
+
+local_script_runner.RerunData = rerun_data
+
+def fragment_of(label):
+    for msg in sent:
+        element = msg.delta.new_element
+        kind = element.WhichOneof('type')
+        if kind and getattr(getattr(element, kind), 'label', None) == label:
+            return msg.delta.fragment_id
+    return ''
+
+def step(label=None, interact=None):
+    scoped[:] = [fragment_of(label)] if label and fragment_of(label) else []
+    if interact:
+        interact()
+    elif label:
+        [b for b in at.button if b.label == label][0].click()
+    del sent[:]
+    start = time.perf_counter()
+    at.run()
+    result = {'s': time.perf_counter() - start, 'bytes': sum(m.ByteSize() for m in sent), 'fragment': bool(scoped)}
+    if scoped:
+        # AppTest keeps only the fragment's elements after a scoped rerun, an
+        # unmeasured full rerun brings back the rest of the page for the next step
+        scoped[:] = []
+        at.run()
+    return result
+
+at = AppTest.from_file('app.py', default_timeout=120)
+steps = {'load': step(), 'predict': step('Predict')}
+what_if = [m for m in at.multiselect if m.label.startswith('Features to vary')]
+if what_if:
+    steps['what_if'] = step(what_if[0].label, lambda: what_if[0].select('Debtor'))
+steps['plan'] = step('Generate Intervention Plan')
+print(json.dumps({'steps': steps, 'exceptions': [str(e.value) for e in at.exception]}))
+"""
+
+
+def run_script(script, *args):
+    out = subprocess.run(
+        [sys.executable, '-W', 'ignore', *args, '-c', script],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if out.returncode:
+        lines = out.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"profiling script exited with status {out.returncode}")
+    return out
+
+
+def slowest_imports(top=10):
+    """Modules with the largest cumulative import time under `import app`"""
+    out = run_script(IMPORT_SCRIPT, '-X', 'importtime')
+    rows = []
+    for line in out.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        # Top-level modules and their direct imports; deeper ones are counted in those
+        if match and len(match.group(3)) <= 3 and match.group(4) not in ('app', 'site'):
+            rows.append((match.group(4), int(match.group(2)) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def profile(repeat=3):
+    """Median of repeat fresh-process runs per measurement"""
+    import statistics
+
+    imports = [json.loads(run_script(IMPORT_SCRIPT).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    renders = [json.loads(run_script(RENDER_SCRIPT).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    interactions = [json.loads(run_script(INTERACTION_SCRIPT).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    exceptions = [e for r in renders + interactions for e in r['exceptions']]
+    if exceptions:
+        raise RuntimeError(f"app.py raised during a profiled run: {exceptions[0]}")
+
+    metrics = {
+        'startup.import_streamlit_s': metric(statistics.median(r['streamlit_s'] for r in imports), 's'),
+        'startup.import_app_s': metric(statistics.median(r['app_s'] for r in imports), 's'),
+        'startup.first_render_s': metric(statistics.median(r['first_render_s'] for r in renders), 's'),
+        'startup.full_run_s': metric(statistics.median(r['full_run_s'] for r in renders), 's'),
+    }
+    for name in interactions[0]['steps']:
+        steps = [r['steps'][name] for r in interactions]
+        metrics[f'interaction.{name}_s'] = metric(statistics.median(step['s'] for step in steps), 's')
+        metrics[f'interaction.{name}_bytes'] = metric(statistics.median(step['bytes'] for step in steps), 'bytes')
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'repeat': repeat,
+            'heavy_modules_after_import': imports[0]['heavy'],
+            'slowest_imports': slowest_imports(),
+            'fragment_scoped_steps': [name for name, step in interactions[0]['steps'].items() if step['fragment']],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'metrics': metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile app import time, time to first render and interaction payloads")
+    parser.add_argument('-o', '--output', default=None, help="write the results as JSON")
+    parser.add_argument('--repeat', type=int, default=3, help="fresh-process runs per measurement")
+    args = parser.parse_args(argv)
+
+    results = profile(args.repeat)
+    for name, m in results['metrics'].items():
+        print(f"{name:32s} {m['value']:>12,.3f} {m['unit']}")
+    print(f"\nHeavy modules loaded by `import app`: {', '.join(results['meta']['heavy_modules_after_import']) or 'none'}")
+    print("Slowest imports under `import app`:")
+    for name, seconds in results['meta']['slowest_imports']:
+        print(f"  {name:30s} {seconds:.3f}s")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Bounded-memory scoring of student extracts larger than RAM.
+
+Reads the semicolon-delimited raw format (data/data.csv) or the
+comma-delimited encoded format (data/encoded_data.csv) in fixed-size chunks,
+scores each chunk and appends the results to the output file:
+
+    python -m dropout.streaming registrar_export.csv -o scored.csv
+"""
+
+import argparse
+import resource
+import sys
+import time
+from pathlib import Path
+
+from dropout.features import MODEL_PATH, PREPROCESSING_PATH, STATUS_CODES, TARGET
+from dropout.scoring import BACKENDS, feature_matrix, load_pipeline, predict_batch, with_scores
+
+DEFAULT_CHUNK_SIZE = 20_000
+
+
+def sniff_delimiter(path):
+    """Tell the raw ';' format apart from the encoded ',' format by its header"""
+    with open(path, encoding='utf-8-sig') as f:
+        header = f.readline()
+    return ';' if header.count(';') > header.count(',') else ','
+
+
+def encode_chunk(df):
+    """Apply the notebook's label encoding to a raw chunk
+
+    The fixed STATUS_CODES mapping is used instead of fitting a LabelEncoder
+    per chunk, so codes stay consistent across chunks.
+    """
+    from pandas.api.types import is_numeric_dtype
+
+    if TARGET in df.columns and not is_numeric_dtype(df[TARGET]):
+        df[TARGET] = df[TARGET].map(STATUS_CODES)
+    return df
+
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = self.path.suffix.lower() in ('.parquet', '.pq')
+        self._writer = None
+        self._header = True
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def peak_memory_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sep=None, total_rows=None):
+    """Yield (chunk, fraction_of_rows_read) pairs
+
+    The fraction is rows parsed over the file's line count, counted up front
+    unless total_rows is given. Blank lines and quoted newlines make the
+    count an upper bound, so 100% is never reported before the last row.
+    The file position is no use here: the parser reads ahead in large blocks.
+    """
+    import pandas as pd
+
+    from dropout.columnar import count_rows
+
+    sep = sep or sniff_delimiter(path)
+    total = max(total_rows if total_rows is not None else count_rows(path), 1)
+    rows = 0
+    for chunk in pd.read_csv(path, sep=sep, chunksize=chunk_size, encoding='utf-8-sig'):
+        rows += len(chunk)
+        yield chunk, min(rows / total, 1.0)
+
+
+def score_stream(input_path, output_path, model, scaler, chunk_size=DEFAULT_CHUNK_SIZE,
+                 sep=None, progress=sys.stderr):
+    """Score input_path chunk by chunk, writing results as they are produced"""
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk, fraction in iter_chunks(input_path, chunk_size, sep):
+            chunk = encode_chunk(chunk)
+            predictions, probabilities = predict_batch(feature_matrix(chunk), model, scaler)
+            writer.write(with_scores(chunk, predictions, probabilities))
+
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            if progress is not None:
+                print(
+                    f"{fraction:6.1%}  {rows:,} rows  {rows / max(elapsed, 1e-9):,.0f} rows/s  "
+                    f"peak {peak_memory_mb():,.0f} MB",
+                    file=progress,
+                )
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream-score a large student extract in chunks")
+    parser.add_argument('input', help="raw (';') or encoded (',') CSV extract")
+    parser.add_argument('-o', '--output', required=True, help="CSV or Parquet file to write")
+    parser.add_argument('--sep', default=None, help="CSV delimiter, detected from the header by default")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    parser.add_argument('--quiet', action='store_true', help="do not report per-chunk progress")
+    args = parser.parse_args(argv)
+
+    model, scaler = load_pipeline(args.backend, args.model, args.preprocessing)
+    rows, elapsed = score_stream(
+        args.input, args.output, model, scaler,
+        chunk_size=args.chunk_size, sep=args.sep,
+        progress=None if args.quiet else sys.stderr,
+    )
+    print(f"Scored {rows:,} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Stylesheets of the app's custom HTML cards and the bulk plan reports.
+
+Kept free of heavy imports so the app can register its styles before the
+model and NumPy are loaded.
+"""
+
+import re
+
+PLAN_CSS = """
+.plan-container {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+}
+.risk-card {
+    background-color: white;
+    border-radius: 10px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    padding: 20px;
+    margin-bottom: 4px;
+    transition: transform 0.2s ease;
+}
+.risk-card:hover {
+    transform: translateY(-5px);
+}
+.risk-header {
+    display: flex;
+    align-items: center;
+    margin-bottom: 4px;
+}
+.risk-icon {
+    background-color: #f0f8ff;
+    width: 40px;
+    height: 40px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin-right: 15px;
+    color: #3498db;
+    font-size: 20px;
+}
+.risk-title {
+    font-size: 18px;
+    font-weight: 600;
+    color: #2c3e50;
+}
+.risk-description {
+    padding-left: 55px;
+    color: #4a5568;
+    font-size: 15px;
+    border-radius: 10px;
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
+    padding: 16px 20px;
+    margin-bottom: 16px;
+}
+.interventions-container {
+    background-color: #f8fafc;
+    border-radius: 10px;
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
+    padding: 8px 14px;
+}
+.intervention-item {
+    display: flex;
+    margin-bottom: 8px;
+    font-size: 20px;
+    color: #2d3748;
+    line-height: 1.5;
+}
+.intervention-bullet {
+    color: #3498db;
+    margin-right: 10px;
+    font-weight: bold;
+}
+.intervention-text {
+    color: #2d3748;
+    font-size: 16px;
+}
+.risk-badge {
+    display: inline-block;
+    padding: 5px 12px;
+    border-radius: 20px;
+    font-size: 14px;
+    font-weight: bold;
+    margin-left: 10px;
+}
+.risk-high {
+    background-color: rgba(231, 76, 60, 0.15);
+    color: #c0392b;
+}
+.risk-medium {
+    background-color: rgba(243, 156, 18, 0.15);
+    color: #d35400;
+}
+.risk-low {
+    background-color: rgba(46, 204, 113, 0.15);
+    color: #27ae60;
+}
+.timeline-card {
+    background-color: #f8fafc;
+    border-radius: 10px;
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
+    padding: 16px 20px;
+    margin-bottom: 16px;
+}
+.timeline-header {
+    font-weight: 600;
+    color: #2c3e50;
+    margin-bottom: 10px;
+    display: flex;
+    align-items: center;
+    font-size: 16px;
+}
+.timeline-icon {
+    margin-right: 10px;
+    color: #3498db;
+}
+.timeline-items {
+    padding-left: 25px;
+}
+.timeline-item {
+    display: flex;
+    margin-bottom: 8px;
+    font-size: 15px;
+    color: #2d3748;
+    line-height: 1.5;
+}
+.timeline-item:last-child {
+    margin-bottom: 0;
+}
+.section-header {
+    background: linear-gradient(90deg, #3498db, #2c3e50);
+    color: white;
+    padding: 12px 20px;
+    border-radius: 8px;
+    margin: 30px 0 20px 0;
+    font-weight: 600;
+    display: flex;
+    align-items: center;
+    font-size: 17px;
+}
+.section-icon {
+    margin-right: 10px;
+}
+"""
+
+# Only used by the standalone reports, the app has its own page layout
+PRINT_CSS = """
+body {
+    margin: 0 auto;
+    max-width: 900px;
+    padding: 24px;
+}
+.plan-title {
+    font-size: 24px;
+    color: #2c3e50;
+}
+@media print {
+    .plan-container {
+        break-after: page;
+    }
+    .risk-card, .interventions-container, .timeline-card {
+        box-shadow: none;
+        break-inside: avoid;
+    }
+}
+"""
+
+RECOMMENDATION_CSS = """
+.recommendation-box {
+    background-color: transparent;
+    border-left: 3px solid #27AE60;
+    padding: 12px 18px;
+    margin-bottom: 12px;
+    border-radius: 0;
+}
+.recommendation-title {
+    color: #ECF0F1;
+    font-weight: 600;
+    font-size: 17px;
+    margin-bottom: 4px;
+}
+.recommendation-desc {
+    color: #BDC3C7;
+    font-size: 14px;
+    line-height: 1.5;
+}
+.recommendation-container {
+    background-color: #2C3E50;
+    padding: 20px;
+    border-radius: 8px;
+    margin-bottom: 20px;
+}
+"""
+
+
+def minify_css(css):
+    """Drop comments and the whitespace around CSS punctuation"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r' ?([{};:,>]) ?', r'\1', css).replace(';}', '}').strip()
@@ -0,0 +1,240 @@
+"""Resumable, parallel XGBoost hyperparameter search and model training.
+
+A script version of the Optuna study in model/notebook.ipynb. Trials are
+stored in a local SQLite database, so an interrupted search picks up where
+it stopped when run again, and several worker processes can share the
+study. Each trial trains with XGBoost early stopping on a validation split
+carved out of the training split and is pruned early when its validation
+loss trails the median of earlier trials.
+
+After the search the best parameters are refit on the full resampled
+training split by dropout.pipeline, evaluated on the held-out test split
+and written to model/model_xgb.joblib together with model/preprocessing.json
+and the model manifest:
+
+    python -m dropout.train --trials 100 --workers 4
+    python -m dropout.train --trials 100 --workers 4   # resumes, runs the rest
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from dropout.features import ENCODED_DATA_PATH, INSIGHTS_PATH, MANIFEST_PATH, MODEL_PATH, PREPROCESSING_PATH, ROOT
+from dropout.resample import STRATEGIES
+
+DEFAULT_STORAGE = f"sqlite:///{ROOT / 'model' / 'optuna.sqlite'}"
+DEFAULT_STUDY = 'xgb-dropout'
+EARLY_STOPPING_ROUNDS = 30
+SEED = 42
+
+
+def search_space(trial):
+    """The notebook's search space; n_estimators is the early-stopping cap"""
+    return {
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3),
+        'n_estimators': trial.suggest_int('n_estimators', 100, 500),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+        'gamma': trial.suggest_float('gamma', 0.0, 0.5),
+        'min_child_weight': trial.suggest_int('min_child_weight', 1, 6),
+    }
+
+
+def search_data(data_path=ENCODED_DATA_PATH, strategy='smote'):
+    """Fit/validation split of the training split, the test split stays unseen
+
+    Returns the scaled arrays plus the resampling strategy's XGBoost params.
+    """
+    from sklearn.model_selection import train_test_split
+
+    from dropout.preprocessing import fit_scaler, load_training_frame, split_training_data
+    from dropout.resample import resample
+
+    df, _ = load_training_frame(data_path)
+    X_train, _, y_train, _ = split_training_data(df)
+    X_fit, X_valid, y_fit, y_valid = train_test_split(
+        X_train, y_train, test_size=0.2, stratify=y_train, random_state=SEED,
+    )
+    X_fit, y_fit, fit_params = resample(X_fit, y_fit, strategy, SEED)
+    scaler = fit_scaler(X_fit)
+    return scaler.transform(X_fit), np.asarray(y_fit), scaler.transform(X_valid), np.asarray(y_valid), fit_params
+
+
+def pruning_callback(trial):
+    """XGBoost callback reporting validation log loss to Optuna after each round"""
+    import optuna
+    import xgboost as xgb
+
+    class PruningCallback(xgb.callback.TrainingCallback):
+        def after_iteration(self, model, epoch, evals_log):
+            # Negated so that, like F1, higher is better for the study direction
+            trial.report(-evals_log['validation_0']['logloss'][-1], epoch)
+            if trial.should_prune():
+                raise optuna.TrialPruned(f"pruned at round {epoch}")
+            return False
+
+    return PruningCallback()
+
+
+def make_objective(data, n_jobs=1):
+    from sklearn.metrics import f1_score
+    from xgboost import XGBClassifier
+
+    X_fit, y_fit, X_valid, y_valid, fit_params = data
+
+    def objective(trial):
+        model = XGBClassifier(
+            **search_space(trial),
+            **fit_params,
+            random_state=SEED,
+            eval_metric='logloss',
+            early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+            callbacks=[pruning_callback(trial)],
+            n_jobs=n_jobs,
+        )
+        model.fit(X_fit, y_fit, eval_set=[(X_valid, y_valid)], verbose=False)
+        trial.set_user_attr('best_iteration', int(model.best_iteration))
+        return f1_score(y_valid, model.predict(X_valid))
+
+    return objective
+
+
+def load_study(storage=DEFAULT_STORAGE, study_name=DEFAULT_STUDY, seed=SEED):
+    """Create or reopen the persisted study
+
+    Heartbeats let a resumed run spot trials left RUNNING by a crashed
+    process; they are marked failed and re-queued once (Optuna 4.9 or later).
+    """
+    import optuna
+    from optuna.storages import RDBStorage, RetryHeartbeatStaleTrialCallback
+
+    rdb = RDBStorage(
+        storage,
+        heartbeat_interval=60,
+        grace_period=180,
+        heartbeat_stale_trial_callback=RetryHeartbeatStaleTrialCallback(max_retry=1),
+    )
+    return optuna.create_study(
+        study_name=study_name,
+        storage=rdb,
+        direction='maximize',
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=20),
+        load_if_exists=True,
+    )
+
+
+def run_worker(storage, study_name, data_path, n_trials, timeout, worker, n_jobs, strategy='smote'):
+    """Run trials until the study holds n_trials finished trials or time runs out"""
+    import optuna
+    from optuna.study import MaxTrialsCallback
+    from optuna.trial import TrialState
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = load_study(storage, study_name, seed=SEED + worker)
+    study.optimize(
+        make_objective(search_data(data_path, strategy), n_jobs),
+        timeout=timeout,
+        callbacks=[MaxTrialsCallback(n_trials, states=(TrialState.COMPLETE, TrialState.PRUNED))],
+    )
+    return worker
+
+
+def finished_trials(study):
+    from optuna.trial import TrialState
+
+    return [t for t in study.trials if t.state in (TrialState.COMPLETE, TrialState.PRUNED)]
+
+
+def search(storage=DEFAULT_STORAGE, study_name=DEFAULT_STUDY, data_path=ENCODED_DATA_PATH,
+           n_trials=100, timeout=None, workers=1, strategy='smote'):
+    """Top the study up to n_trials finished trials across worker processes"""
+    study = load_study(storage, study_name)
+    if len(finished_trials(study)) >= n_trials:
+        return study
+
+    # Split the cores between workers so they do not oversubscribe the CPU
+    n_jobs = max(1, (os.cpu_count() or 1) // workers)
+    if workers == 1:
+        run_worker(storage, study_name, data_path, n_trials, timeout, 0, n_jobs, strategy)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            futures = [
+                pool.submit(run_worker, storage, study_name, data_path, n_trials, timeout, worker, n_jobs, strategy)
+                for worker in range(workers)
+            ]
+            for future in futures:
+                future.result()
+    return load_study(storage, study_name)
+
+
+def fit_best(params, data_path=ENCODED_DATA_PATH, model_path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH,
+             manifest_path=MANIFEST_PATH, strategy='smote', insights_path=INSIGHTS_PATH):
+    """Refit on the resampled training split through the cached pipeline
+
+    Returns the held-out test metrics.
+    """
+    from dropout import pipeline
+
+    manifest = pipeline.run(
+        params, data_path, model_path, preprocessing_path, manifest_path, strategy=strategy, insights_path=insights_path,
+    )
+    return manifest['test_metrics']
+
+
+def best_params(study):
+    """Best trial's parameters with n_estimators set to the early-stopped length"""
+    trial = study.best_trial
+    params = dict(trial.params)
+    if 'best_iteration' in trial.user_attrs:
+        params['n_estimators'] = trial.user_attrs['best_iteration'] + 1
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the persisted XGBoost hyperparameter search and train the model")
+    parser.add_argument('--data', default=ENCODED_DATA_PATH, help="encoded training CSV or columnar directory")
+    parser.add_argument('--storage', default=DEFAULT_STORAGE, help="Optuna RDB storage URL")
+    parser.add_argument('--study', default=DEFAULT_STUDY, help="study name inside the storage")
+    parser.add_argument('--trials', type=int, default=100, help="total finished trials the study should hold")
+    parser.add_argument('--timeout', type=float, default=None, help="seconds each worker may search")
+    parser.add_argument('--workers', type=int, default=1, help="number of worker processes")
+    parser.add_argument('--resample', choices=STRATEGIES, default='smote', help="class-imbalance strategy")
+    parser.add_argument('--model', default=MODEL_PATH, help="where to write the trained model")
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH, help="where to write its preprocessing bundle")
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help="where to record the model's inputs")
+    parser.add_argument('--insights', default=INSIGHTS_PATH, help="where to write the app's model insights")
+    parser.add_argument('--search-only', action='store_true', help="do not refit and save the best model")
+    args = parser.parse_args(argv)
+
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    start = time.perf_counter()
+    study = search(args.storage, args.study, args.data, args.trials, args.timeout, args.workers, args.resample)
+    trials = finished_trials(study)
+    pruned = sum(t.state.name == 'PRUNED' for t in trials)
+    print(f"Study {args.study!r}: {len(trials)} finished trials ({pruned} pruned) "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"Best validation F1 {study.best_value:.4f} (trial {study.best_trial.number})")
+    params = best_params(study)
+    for name, value in params.items():
+        print(f"  {name}: {value}")
+    if args.search_only:
+        return
+
+    metrics = fit_best(params, args.data, args.model, args.preprocessing, args.manifest, args.resample, args.insights)
+    print("Test set: " + ', '.join(f"{name} {value:.4f}" for name, value in metrics.items()))
+    print(f"Wrote {args.model}, {args.preprocessing} and {args.manifest}")
+    if str(args.model) == str(MODEL_PATH):
+        print("Refresh the other backends with `python -m dropout.fold` and `python -m dropout.export`")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""What-if sensitivity of one student's dropout probability.
+
+Varies one or two features over a grid around a student's profile, keeping
+every other feature as it is, and scores the whole grid in one batched
+predict_proba call:
+
+    python -m dropout.whatif students.csv --row 0 --vary Curricular_units_2nd_sem_approved Debtor
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from dropout.features import FEATURE_NAMES, MODEL_PATH, PREPROCESSING_PATH
+from dropout.scoring import predict_batch
+
+# Features advisors can act on or ask about, with the grid each is varied over.
+# Approved units are capped at the units the student is enrolled in.
+WHATIF_FEATURES = {
+    'Curricular_units_1st_sem_approved': {'low': 0, 'high': 20, 'step': 1, 'cap': 'Curricular_units_1st_sem_enrolled'},
+    'Curricular_units_2nd_sem_approved': {'low': 0, 'high': 20, 'step': 1, 'cap': 'Curricular_units_2nd_sem_enrolled'},
+    'Curricular_units_1st_sem_grade': {'low': 0.0, 'high': 20.0, 'step': 0.5},
+    'Curricular_units_2nd_sem_grade': {'low': 0.0, 'high': 20.0, 'step': 0.5},
+    'Tuition_fees_up_to_date': {'values': [0, 1]},
+    'Debtor': {'values': [0, 1]},
+    'Scholarship_holder': {'values': [0, 1]},
+    'Admission_grade': {'low': 95.0, 'high': 190.0, 'step': 2.5},
+    'Age_at_enrollment': {'low': 17, 'high': 70, 'step': 1},
+}
+
+MAX_FEATURES = 2
+
+
+def feature_values(name, student):
+    """Grid of values for one feature, always including the student's own"""
+    spec = WHATIF_FEATURES[name]
+    if 'values' in spec:
+        values = np.asarray(spec['values'], dtype=np.float64)
+    else:
+        high = spec['high']
+        if 'cap' in spec:
+            high = max(min(high, student[spec['cap']]), student[name])
+        values = np.arange(spec['low'], high + spec['step'] / 2, spec['step'], dtype=np.float64)
+    return np.union1d(values, [float(student[name])])
+
+
+def scenarios(student, names):
+    """(m, 36) feature matrix of every grid combination, plus each axis' values"""
+    if not 1 <= len(names) <= MAX_FEATURES:
+        raise ValueError(f"Vary between 1 and {MAX_FEATURES} features, got {len(names)}")
+    unknown = [name for name in names if name not in WHATIF_FEATURES]
+    if unknown:
+        raise ValueError(f"Unsupported what-if features: {', '.join(unknown)}")
+
+    axes = [feature_values(name, student) for name in names]
+    base = np.array([student[name] for name in FEATURE_NAMES], dtype=np.float64)
+    X = np.tile(base, (int(np.prod([len(axis) for axis in axes])), 1))
+    for column, grid in zip(names, np.meshgrid(*axes, indexing='ij')):
+        X[:, FEATURE_NAMES.index(column)] = grid.ravel()
+    return X, axes
+
+
+def sensitivity(student, names, model, scaler):
+    """Dropout probability over the grid of the named features
+
+    Returns the axes' values and the probabilities shaped (len(axis),) for
+    one feature or (len(axis0), len(axis1)) for two.
+    """
+    X, axes = scenarios(student, names)
+    _, probabilities = predict_batch(X, model, scaler)
+    return axes, probabilities[:, 0].reshape([len(axis) for axis in axes])
+
+
+def main(argv=None):
+    from dropout.explain import feature_label
+    from dropout.scoring import BACKENDS, load_pipeline, read_table
+
+    parser = argparse.ArgumentParser(description="Dropout probability of one student as chosen features vary")
+    parser.add_argument('input', help="CSV, Parquet or columnar directory with the 36 feature columns")
+    parser.add_argument('--row', type=int, default=0, help="row of the student to explore")
+    parser.add_argument('--vary', nargs='+', required=True, choices=list(WHATIF_FEATURES), metavar='FEATURE',
+                        help=f"one or two of: {', '.join(WHATIF_FEATURES)}")
+    parser.add_argument('--sep', default=',', help="CSV delimiter (use ';' for data/data.csv)")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessing', default=PREPROCESSING_PATH)
+    parser.add_argument('--backend', choices=BACKENDS, default='joblib')
+    args = parser.parse_args(argv)
+
+    model, scaler = load_pipeline(args.backend, args.model, args.preprocessing)
+    student = read_table(args.input, sep=args.sep).iloc[args.row].to_dict()
+    start = time.perf_counter()
+    axes, probability = sensitivity(student, args.vary, model, scaler)
+    elapsed = time.perf_counter() - start
+
+    labels = [feature_label(name) for name in args.vary]
+    print(f"{' / '.join(labels):45s} dropout probability")
+    for index in itertools.product(*(range(len(axis)) for axis in axes)):
+        values = ' / '.join(f"{axis[i]:g}" for axis, i in zip(axes, index))
+        current = all(axis[i] == student[name] for axis, i, name in zip(axes, index, args.vary))
+        print(f"{values:45s} {probability[index]:.1%}{'  <- current' if current else ''}")
+    print(f"\nScored {probability.size:,} scenarios in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()